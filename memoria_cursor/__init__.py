@@ -17,9 +17,27 @@ __version__ = "1.0.6"
 __author__ = "Tu Nombre"
 __email__ = "tu@email.com"
 
-from .core.memory_system import MemorySystem
-from .core.entry import Entry
-from .core.git_integration import GitIntegration
+# Importación diferida (PEP 562): `memoria --help` no paga el coste de cargar
+# jsonschema, rich, etc. hasta que se use alguna de estas clases.
+_LAZY_IMPORTS = {
+    "MemorySystem": ".core.memory_system",
+    "Entry": ".core.entry",
+    "GitIntegration": ".core.git_integration",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
 
 __all__ = [
     "MemorySystem",
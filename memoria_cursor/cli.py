@@ -8,12 +8,11 @@ import traceback
 from pathlib import Path
 from typing import Optional, List
 
-from .core.memory_system import MemorySystem
-from .tools.create import create_entry, create_entry_interactive
-from .tools.list import list_entries, display_entries, display_entry_details, search_entries_interactive
-from .tools.export import LLMExporter
 from . import __version__
 
+# Los módulos de core/ y tools/ se importan dentro de cada subcomando para
+# que `memoria --help` y `memoria --version` arranquen rápido.
+
 
 @click.group()
 @click.version_option(version=__version__, prog_name="memoria-cursor")
@@ -43,6 +42,9 @@ def main(ctx, project_root):
 @click.pass_context
 def create(ctx, type, title, content, tags, files, llm_context, related_entries, interactive):
     """Crear una nueva entrada en el sistema de memoria."""
+    from .core.memory_system import MemorySystem
+    from .tools.create import create_entry, create_entry_interactive
+    
     project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
     
     if interactive:
@@ -87,6 +89,7 @@ def create(ctx, type, title, content, tags, files, llm_context, related_entries,
 @main.command(name="list")
 @click.option('--limit', '-n', type=int, help='Número máximo de entradas a mostrar')
 @click.option('--offset', '-o', type=int, default=0, help='Número de entradas a omitir desde el inicio (para paginación)')
+@click.option('--after', help='Continuar después de la entrada con este ID (paginación por cursor)')
 @click.option('--type', '-t', help='Filtrar por tipo de entrada')
 @click.option('--tags', '-g', multiple=True, help='Filtrar por etiquetas')
 @click.option('--search', '-s', help='Buscar en título y contenido')
@@ -96,8 +99,10 @@ def create(ctx, type, title, content, tags, files, llm_context, related_entries,
 @click.option('--stats', is_flag=True, help='Mostrar estadísticas en lugar de entradas')
 @click.option('--interactive', '-i', is_flag=True, help='Modo interactivo')
 @click.pass_context
-def list_cmd(ctx, limit, offset, type, tags, search, date_from, date_to, show_git, stats, interactive):
+def list_cmd(ctx, limit, offset, after, type, tags, search, date_from, date_to, show_git, stats, interactive):
     """Listar entradas del sistema de memoria."""
+    from .tools.list import list_entries, display_entries, search_entries_interactive
+    
     project_root = ctx.obj['PROJECT_ROOT']
     
     if interactive:
@@ -105,9 +110,10 @@ def list_cmd(ctx, limit, offset, type, tags, search, date_from, date_to, show_gi
         return
     
     try:
+        # Con límite se pide una entrada más para saber si hay otra página
         entries = list_entries(
             project_root=project_root,
-            limit=limit,
+            limit=limit + 1 if limit else limit,
             offset=offset,
             entry_type=type,
             tags=list(tags),
@@ -115,11 +121,16 @@ def list_cmd(ctx, limit, offset, type, tags, search, date_from, date_to, show_gi
             date_from=date_from,
             date_to=date_to,
             show_git=show_git,
-            stats=stats
+            stats=stats,
+            after=after
         )
         
         if not stats:
-            display_entries(entries, show_git=show_git, limit=limit, offset=offset)
+            has_more = bool(limit) and len(entries) > limit
+            if has_more:
+                entries = entries[:limit]
+            display_entries(entries, show_git=show_git, limit=limit, offset=offset,
+                            has_more=has_more)
     
     except Exception as e:
         click.echo(f"❌ Error al listar entradas: {e}", err=True)
@@ -132,6 +143,9 @@ def list_cmd(ctx, limit, offset, type, tags, search, date_from, date_to, show_gi
 @click.pass_context
 def show(ctx, entry_id, show_git):
     """Mostrar detalles completos de una entrada específica."""
+    from .core.memory_system import MemorySystem
+    from .tools.list import display_entry_details
+    
     project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
     
     try:
@@ -169,6 +183,8 @@ def show(ctx, entry_id, show_git):
 @click.pass_context
 def export(ctx, output_format, include_git, group_by, limit, summary, entry_type, tags, search, date_from, date_to, chunked, max_chars, max_tokens):
     """Exportar entradas en formato optimizado para LLM."""
+    from .tools.export import LLMExporter
+    
     project_root = ctx.obj['PROJECT_ROOT']
     
     try:
@@ -205,6 +221,8 @@ def export(ctx, output_format, include_git, group_by, limit, summary, entry_type
 @click.pass_context
 def init(ctx, name, description):
     """Inicializar el sistema de memoria en el proyecto actual."""
+    from .core.memory_system import MemorySystem
+    
     project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
     
     try:
@@ -222,10 +240,32 @@ def init(ctx, name, description):
         raise click.Abort()
 
 
+@main.command()
+@click.pass_context
+def reindex(ctx):
+    """Reconstruir el índice de búsqueda desde entries.json."""
+    from .core.memory_system import MemorySystem
+    
+    project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
+    
+    try:
+        memory_system = MemorySystem(project_root)
+        if memory_system.rebuild_search_index():
+            click.echo(f"✅ Índice de búsqueda reconstruido: {memory_system.search_index.index_file}")
+        else:
+            click.echo("⚠️  SQLite FTS5 no disponible; las búsquedas recorren todas las entradas")
+    
+    except Exception as e:
+        click.echo(f"❌ Error al reconstruir el índice: {e}", err=True)
+        raise click.Abort()
+
+
 @main.command()
 @click.pass_context
 def status(ctx):
     """Mostrar estado del sistema de memoria."""
+    from .core.memory_system import MemorySystem
+    
     project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
     
     try:
@@ -279,6 +319,8 @@ def status(ctx):
 @click.pass_context
 def update(ctx, entry_id, title, content, tags, files, llm_context):
     """Actualizar una entrada existente."""
+    from .core.memory_system import MemorySystem
+    
     project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
     
     try:
@@ -321,6 +363,8 @@ def update(ctx, entry_id, title, content, tags, files, llm_context):
 @click.pass_context
 def delete(ctx, entry_id, force):
     """Eliminar una entrada del sistema."""
+    from .core.memory_system import MemorySystem
+    
     project_root = ctx.obj.get('PROJECT_ROOT') if ctx and ctx.obj else Path('.').resolve()
     
     try:
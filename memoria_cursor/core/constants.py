@@ -0,0 +1,9 @@
+"""
+Constantes compartidas del sistema de memoria.
+"""
+
+# Tipos de entrada admitidos, en el orden en que se muestran al usuario
+ENTRY_TYPES = ("decision", "change", "context", "bug", "feature", "note")
+
+# Conjunto para comprobar pertenencia sin recorrer la tupla
+VALID_ENTRY_TYPES = frozenset(ENTRY_TYPES)
@@ -2,14 +2,57 @@
 Clase Entry para representar entradas del sistema de memoria.
 """
 
-import json
-import uuid
+import os
+import sys
+import time
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass, field
 
+from .serialization import dumps, dumps_bytes
 
-@dataclass
+
+# `slots=True` (sin __dict__ por instancia) solo está disponible desde Python 3.10
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Último segundo formateado por `now_iso` (epoch en segundos, "YYYY-MM-DDTHH:MM:SS")
+_last_second: Tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """
+    Obtener la fecha y hora actual en UTC como string ISO-8601.
+    
+    Produce lo mismo que `datetime.now(timezone.utc).isoformat()`, pero solo
+    construye un datetime una vez por segundo: el resto de llamadas formatean
+    los microsegundos sobre el prefijo ya calculado.
+    """
+    global _last_second
+    seconds, micro = divmod(time.time_ns() // 1000, 1000000)
+    if _last_second[0] != seconds:
+        prefix = datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _last_second = (seconds, prefix)
+    if micro:
+        return f"{_last_second[1]}.{micro:06d}+00:00"
+    return f"{_last_second[1]}+00:00"
+
+
+def search_text(title: str, content: str, llm_context: Optional[str],
+                tags: List[str], files_affected: List[str]) -> str:
+    """
+    Construir el texto en minúsculas sobre el que se buscan términos.
+    
+    Une título, contenido, contexto LLM, etiquetas y archivos con un carácter
+    NUL, de modo que una sola comprobación `término in texto` equivale a
+    buscar en cada campo por separado.
+    """
+    parts = [title, content, llm_context or ""]
+    parts.extend(tags)
+    parts.extend(files_affected)
+    return "\x00".join(parts).lower()
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Entry:
     """
     Representa una entrada en el sistema de memoria.
@@ -38,17 +81,31 @@ class Entry:
     timestamp: Optional[str] = None
     entry_id: Optional[str] = None
     
+    # Caché interna del texto de búsqueda para `matches_search` (no se serializa)
+    _search_source: Optional[Tuple[Any, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _search_lc: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Inicializar valores por defecto después de la creación."""
         if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc).isoformat()
+            self.timestamp = now_iso()
         
         if self.entry_id is None:
             self.entry_id = self._generate_id()
     
     def _generate_id(self) -> str:
-        """Generar ID único usando UUID."""
-        return str(uuid.uuid4())
+        """
+        Generar ID único con formato UUID versión 4.
+        
+        Equivale a `str(uuid.uuid4())` sin construir el objeto UUID: se fijan
+        los bits de versión y variante sobre 16 bytes aleatorios y se formatea
+        directamente en hexadecimal 8-4-4-4-12.
+        """
+        raw = bytearray(os.urandom(16))
+        raw[6] = (raw[6] & 0x0F) | 0x40
+        raw[8] = (raw[8] & 0x3F) | 0x80
+        h = raw.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertir entrada a diccionario."""
@@ -58,9 +115,9 @@ class Entry:
             "type": self.entry_type,
             "title": self.title,
             "content": self.content,
-            "tags": self.tags,
-            "files_affected": self.files_affected,
-            "related_entries": self.related_entries,
+            "tags": list(self.tags),
+            "files_affected": list(self.files_affected),
+            "related_entries": list(self.related_entries),
         }
         if self.llm_context is not None:
             data["llm_context"] = self.llm_context
@@ -70,23 +127,49 @@ class Entry:
     
     def to_json(self) -> str:
         """Convertir entrada a JSON string."""
-        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        return dumps(self.to_dict())
+    
+    def to_json_bytes(self) -> bytes:
+        """Convertir entrada a JSON codificado en UTF-8 (sin decodificar a str)."""
+        return dumps_bytes(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Entry':
-        """Crear entrada desde diccionario."""
-        return cls(
-            entry_type=data.get("type", ""),
-            title=data.get("title", ""),
-            content=data.get("content", ""),
-            tags=data.get("tags", []),
-            files_affected=data.get("files_affected", []),
-            llm_context=data.get("llm_context"),
-            git_info=data.get("git_info"),
-            related_entries=data.get("related_entries", []),
-            timestamp=data.get("timestamp"),
-            entry_id=data.get("id")
-        )
+        """
+        Crear entrada desde diccionario.
+        
+        Las entradas escritas por `to_dict` tienen siempre las claves
+        obligatorias, así que se leen por índice directo; si falta alguna se
+        recurre a la lectura con valores por defecto. Las listas se copian para
+        no compartirlas con el diccionario de origen.
+        """
+        get = data.get
+        try:
+            return cls(
+                entry_type=data["type"],
+                title=data["title"],
+                content=data["content"],
+                tags=list(data["tags"] or ()),
+                files_affected=list(data["files_affected"] or ()),
+                llm_context=get("llm_context"),
+                git_info=get("git_info"),
+                related_entries=list(data["related_entries"] or ()),
+                timestamp=data["timestamp"],
+                entry_id=data["id"]
+            )
+        except KeyError:
+            return cls(
+                entry_type=get("type", ""),
+                title=get("title", ""),
+                content=get("content", ""),
+                tags=list(get("tags") or ()),
+                files_affected=list(get("files_affected") or ()),
+                llm_context=get("llm_context"),
+                git_info=get("git_info"),
+                related_entries=list(get("related_entries") or ()),
+                timestamp=get("timestamp"),
+                entry_id=get("id")
+            )
     
     def add_tag(self, tag: str) -> None:
         """Agregar etiqueta a la entrada."""
@@ -129,27 +212,46 @@ class Entry:
     
     def has_related_entries(self) -> bool:
         """Verificar si la entrada tiene entradas relacionadas."""
-        return len(self.related_entries) > 0
+        return bool(self.related_entries)
     
     def update_content(self, new_content: str) -> None:
         """Actualizar contenido de la entrada."""
         self.content = new_content
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = now_iso()
     
     def has_tag(self, tag: str) -> bool:
         """Verificar si la entrada tiene una etiqueta específica."""
         return tag in self.tags
     
+    def _search_text(self) -> str:
+        """
+        Obtener el texto de búsqueda de la entrada (ver `search_text`).
+        
+        Se recalcula solo si alguno de los campos cambió desde la última llamada.
+        """
+        source = (self.title, self.content, self.llm_context,
+                  tuple(self.tags), tuple(self.files_affected))
+        if self._search_lc is None or self._search_source != source:
+            self._search_source = source
+            self._search_lc = search_text(self.title, self.content, self.llm_context,
+                                          self.tags, self.files_affected)
+        return self._search_lc
+    
     def matches_search(self, search_term: str) -> bool:
         """Verificar si la entrada coincide con un término de búsqueda."""
-        search_lower = search_term.lower()
-        return (
-            search_lower in self.title.lower()
-            or search_lower in self.content.lower()
-            or (self.llm_context is not None and search_lower in self.llm_context.lower())
-            or any(search_lower in tag.lower() for tag in self.tags)
-            or any(search_lower in file_path.lower() for file_path in self.files_affected)
-        )
+        return self.matches_lowercase(search_term.lower())
+    
+    def matches_lowercase(self, search_lower: str) -> bool:
+        """
+        Verificar coincidencia con un término ya pasado a minúsculas.
+        
+        Permite filtrar muchas entradas con el mismo término sin volver a
+        normalizarlo en cada llamada.
+        """
+        # Un término vacío coincide siempre: no hace falta el texto de búsqueda
+        if not search_lower:
+            return True
+        return search_lower in self._search_text()
     
     def __str__(self) -> str:
         """Representación string de la entrada."""
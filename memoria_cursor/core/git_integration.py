@@ -2,10 +2,17 @@
 Integración automática con Git para capturar información del repositorio.
 """
 
+import os
 import subprocess
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
+try:
+    import pygit2
+except ImportError:  # pygit2 es opcional: se usa el binario git como fallback
+    pygit2 = None
+
 
 class GitIntegration:
     """
@@ -15,8 +22,16 @@ class GitIntegration:
     - Commit actual y mensaje
     - Rama de trabajo
     - Estado del repositorio (limpio/sucio)
+    
+    Si `pygit2` está instalado las consultas se resuelven en proceso mediante
+    libgit2; en caso contrario se invoca el binario `git`.
     """
     
+    # Antigüedad máxima (segundos) de la información cacheada: acota cuánto
+    # puede tardar en reflejarse un cambio en el árbol de trabajo (`is_clean`),
+    # que no modifica HEAD ni el index
+    CACHE_TTL = 5.0
+    
     def __init__(self, project_root: str = "."):
         """
         Inicializar integración con Git.
@@ -25,94 +40,240 @@ class GitIntegration:
             project_root: Ruta raíz del proyecto
         """
         self.project_root = Path(project_root).resolve()
+        
+        # Caché de resultados (válida mientras no cambien HEAD/index)
+        self._is_repo: Optional[bool] = None
+        self._git_dir: Optional[Path] = None
+        self._repo: Any = None
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_key: Optional[Tuple[Optional[int], ...]] = None
+        self._cache_time = 0.0
+        # URL de `origin`, leída solo al pedirla (clave: mtime de .git/config)
+        self._remote_url: Optional[str] = None
+        self._remote_url_key: Optional[Tuple[Optional[int]]] = None
+    
+    # Variables que evitan locks opcionales (p. ej. el refresco del index en
+    # `git status`), salida localizada y prompts interactivos de credenciales
+    _GIT_ENV_OVERRIDES = {
+        'GIT_OPTIONAL_LOCKS': '0',
+        'LC_ALL': 'C',
+        'LANG': 'C',
+        'GIT_TERMINAL_PROMPT': '0',
+    }
+    
+    def _run_git(self, args: List[str], timeout: int = 5) -> subprocess.CompletedProcess:
+        """
+        Ejecutar un comando git en la raíz del proyecto sin shell.
+        
+        La salida se devuelve en bytes; cada llamador decodifica solo lo que usa.
+        """
+        return subprocess.run(
+            ['git', *args],
+            capture_output=True,
+            cwd=self.project_root,
+            env={**os.environ, **self._GIT_ENV_OVERRIDES},
+            timeout=timeout
+        )
     
     def is_git_repository(self) -> bool:
         """Verificar si el directorio es un repositorio Git."""
+        if not self._locate_repository():
+            return False
+        if self._is_repo is not None:
+            return self._is_repo
+        
+        # Hay un `.git` pero sin pygit2: confirmar con el binario git
         try:
-            result = subprocess.run(
-                ['git', 'rev-parse', '--git-dir'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
-            return result.returncode == 0
+            result = self._run_git(['rev-parse', '--git-dir'])
+            self._is_repo = result.returncode == 0
+            if self._is_repo:
+                self._git_dir = self.project_root / os.fsdecode(result.stdout.strip())
+            return self._is_repo
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
+    def _locate_repository(self) -> bool:
+        """
+        Localizar el repositorio sin lanzar procesos.
+        
+        Usa el `.git` encontrado en el árbol (y pygit2 si está instalado).
+        Devuelve False solo cuando se sabe que no hay repositorio; con el
+        binario git el resultado puede quedar sin confirmar (`_is_repo` None)
+        hasta que un comando git tenga éxito o falle.
+        """
+        if self._is_repo is not None:
+            return self._is_repo
+        
+        git_dir = self._find_git_dir()
+        if git_dir is None:
+            self._is_repo = False
+            return False
+        self._git_dir = git_dir
+        
+        if pygit2 is not None:
+            try:
+                discovered = pygit2.discover_repository(str(self.project_root))
+                if discovered:
+                    self._repo = pygit2.Repository(discovered)
+                    self._git_dir = Path(discovered)
+                    self._is_repo = True
+                    return True
+            except Exception:
+                pass
+            self._repo = None
+        
+        return True
+    
+    def _find_git_dir(self) -> Optional[Path]:
+        """
+        Buscar el directorio Git del proyecto o de sus ancestros.
+        
+        Acepta directorios `.git` y archivos `.git` con `gitdir:` (submódulos y
+        worktrees). Respeta la variable de entorno `GIT_DIR`.
+        
+        Returns:
+            Ruta del directorio Git o None si no hay ninguno
+        """
+        env_git_dir = os.environ.get('GIT_DIR')
+        if env_git_dir:
+            return self.project_root / env_git_dir
+        
+        for directory in (self.project_root, *self.project_root.parents):
+            marker = directory / '.git'
+            try:
+                if marker.is_dir():
+                    return marker
+                if marker.is_file():
+                    with open(marker, 'rb') as f:
+                        content = f.read(4096)
+                    if content.startswith(b'gitdir:'):
+                        target = os.fsdecode(content[len(b'gitdir:'):].strip())
+                        return directory / target
+            except OSError:
+                continue
+        return None
+    
+    def _current_key(self) -> Optional[Tuple[Optional[int], ...]]:
+        """
+        Calcular la clave de caché a partir de los mtimes de HEAD, index y logs/HEAD.
+        
+        Returns:
+            Tupla de mtimes (ns) o None si no se conoce el directorio .git
+        """
+        if self._git_dir is None:
+            return None
+        
+        key = []
+        for name in ('HEAD', 'index', os.path.join('logs', 'HEAD')):
+            try:
+                key.append(os.stat(self._git_dir / name).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+    
     def get_git_info(self) -> Optional[Dict[str, Any]]:
         """
         Obtener información completa de Git.
         
+        El resultado se reutiliza mientras no cambien `.git/HEAD`, `.git/index`
+        ni `.git/logs/HEAD`, durante como máximo `CACHE_TTL` segundos.
+        
+        `is_clean` describe el árbol de trabajo completo: los archivos sin
+        seguimiento cuentan como cambios. `is_repository_clean()`, en cambio,
+        solo considera archivos versionados.
+        
         Returns:
             Diccionario con información de Git o None si no es repositorio
         """
-        if not self.is_git_repository():
+        if not self._locate_repository():
             return None
         
+        key = self._current_key()
+        if (key is not None and key == self._cache_key and self._cache is not None
+                and time.monotonic() - self._cache_time < self.CACHE_TTL):
+            return dict(self._cache)
+        
         try:
-            git_info = {}
-            
-            # Commit actual
-            commit_result = subprocess.run(
-                ['git', 'rev-parse', 'HEAD'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
-            if commit_result.returncode == 0:
-                git_info['current_commit'] = commit_result.stdout.strip()[:7]
-            
-            # Mensaje del commit
-            message_result = subprocess.run(
-                ['git', 'log', '-1', '--pretty=format:%s'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
-            if message_result.returncode == 0:
-                git_info['commit_message'] = message_result.stdout.strip()
-            
-            # Rama actual
-            branch_result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
-            if branch_result.returncode == 0:
-                git_info['branch'] = branch_result.stdout.strip()
-            
-            # Estado del repositorio
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
-            git_info['is_clean'] = status_result.returncode == 0 and not status_result.stdout.strip()
-            
-            # Información adicional del repositorio
-            remote_result = subprocess.run(
-                ['git', 'remote', 'get-url', 'origin'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
-            if remote_result.returncode == 0:
-                git_info['remote_url'] = remote_result.stdout.strip()
-            
-            return git_info if git_info else None
-            
+            if self._repo is not None:
+                git_info = self._read_git_info_pygit2()
+            else:
+                git_info = self._read_git_info_subprocess()
         except subprocess.TimeoutExpired:
             return None
         except Exception:
             return None
+        
+        if not git_info:
+            return None
+        
+        # `git status` puede refrescar el index: tomar la clave después
+        self._cache = git_info
+        self._cache_key = self._current_key()
+        self._cache_time = time.monotonic()
+        return dict(git_info)
+    
+    def invalidate_cache(self) -> None:
+        """Descartar la información de Git cacheada."""
+        self._cache = None
+        self._cache_key = None
+        self._remote_url_key = None
+    
+    def _read_git_info_pygit2(self) -> Optional[Dict[str, Any]]:
+        """Leer la información de Git en proceso usando pygit2."""
+        repo = self._repo
+        git_info: Dict[str, Any] = {}
+        
+        if repo.head_is_unborn:
+            head_ref = repo.references['HEAD'].target
+            git_info['branch'] = head_ref[len('refs/heads/'):] if head_ref.startswith('refs/heads/') else head_ref
+        else:
+            head = repo.head
+            commit = repo[head.target]
+            git_info['current_commit'] = str(head.target)[:7]
+            # Equivalente a `%s`: primer párrafo del mensaje en una línea
+            git_info['commit_message'] = ' '.join(commit.message.strip().split('\n\n', 1)[0].split())
+            git_info['branch'] = '' if repo.head_is_detached else head.shorthand
+        
+        git_info['is_clean'] = len(repo.status()) == 0
+        
+        return git_info
+    
+    def _read_git_info_subprocess(self) -> Optional[Dict[str, Any]]:
+        """Leer la información de Git invocando el binario `git`."""
+        git_info: Dict[str, Any] = {}
+        
+        # Commit, rama y estado en una sola invocación (porcelain v2)
+        status_result = self._run_git(['status', '--porcelain=v2', '--branch'])
+        if status_result.returncode != 0:
+            # No es un repositorio (o git no puede leerlo)
+            self._is_repo = False
+            return None
+        self._is_repo = True
+        
+        # Las cabeceras `# branch.*` van primero; la primera línea de cambios
+        # basta para saber que no está limpio, sin decodificar el resto
+        is_clean = True
+        for line in status_result.stdout.split(b'\n'):
+            if line.startswith(b'# branch.oid '):
+                oid = line[len(b'# branch.oid '):].strip()
+                if oid != b'(initial)':
+                    git_info['current_commit'] = oid[:7].decode('ascii')
+            elif line.startswith(b'# branch.head '):
+                head = line[len(b'# branch.head '):].strip().decode('utf-8', 'replace')
+                # En HEAD desacoplado `git branch --show-current` devuelve vacío
+                git_info['branch'] = '' if head == '(detached)' else head
+            elif line and not line.startswith(b'#'):
+                is_clean = False
+                break
+        git_info['is_clean'] = is_clean
+        
+        # Mensaje del commit (solo si hay commits)
+        if 'current_commit' in git_info:
+            message_result = self._run_git(['log', '-1', '--pretty=format:%s'])
+            if message_result.returncode == 0:
+                git_info['commit_message'] = message_result.stdout.decode('utf-8', 'replace').strip()
+        
+        return git_info
     
     def get_current_commit(self) -> Optional[str]:
         """Obtener hash del commit actual."""
@@ -125,9 +286,38 @@ class GitIntegration:
         return git_info.get('branch') if git_info else None
     
     def is_repository_clean(self) -> Optional[bool]:
-        """Verificar si el repositorio está limpio."""
-        git_info = self.get_git_info()
-        return git_info.get('is_clean') if git_info else None
+        """
+        Verificar si el repositorio está limpio.
+        
+        Solo considera archivos versionados (staging y working directory);
+        los archivos sin seguimiento no cuentan como cambios pendientes. Por
+        eso puede devolver True aunque `get_git_info()['is_clean']`, que sí
+        cuenta los archivos sin seguimiento, sea False.
+        """
+        return self._is_clean_fast()
+    
+    def _is_clean_fast(self) -> Optional[bool]:
+        """Comprobar cambios en archivos versionados sin enumerar los no rastreados."""
+        if not self._locate_repository():
+            return None
+        
+        try:
+            if self._repo is not None:
+                try:
+                    return len(self._repo.status(untracked_files='no')) == 0
+                except TypeError:
+                    # pygit2 antiguo sin `untracked_files`: filtrar a posteriori
+                    return not any(
+                        flags != pygit2.GIT_STATUS_WT_NEW
+                        for flags in self._repo.status().values()
+                    )
+            
+            result = self._run_git(['status', '--porcelain', '-z', '--untracked-files=no'])
+            if result.returncode != 0:
+                return None
+            return not result.stdout
+        except (subprocess.TimeoutExpired, Exception):
+            return None
     
     def get_commit_message(self) -> Optional[str]:
         """Obtener mensaje del commit actual."""
@@ -135,9 +325,40 @@ class GitIntegration:
         return git_info.get('commit_message') if git_info else None
     
     def get_remote_url(self) -> Optional[str]:
-        """Obtener URL del repositorio remoto."""
-        git_info = self.get_git_info()
-        return git_info.get('remote_url') if git_info else None
+        """
+        Obtener URL del repositorio remoto `origin`.
+        
+        No forma parte de `get_git_info()`: se consulta solo al pedirla y se
+        reutiliza mientras no cambie `.git/config`.
+        """
+        if not self._locate_repository():
+            return None
+        
+        try:
+            config_mtime: Optional[int] = (self._git_dir / 'config').stat().st_mtime_ns
+        except (OSError, TypeError):
+            config_mtime = None
+        key = (config_mtime,)
+        if key == self._remote_url_key:
+            return self._remote_url
+        
+        remote_url = None
+        try:
+            if self._repo is not None:
+                try:
+                    remote_url = self._repo.remotes['origin'].url
+                except (KeyError, ValueError):
+                    pass
+            else:
+                result = self._run_git(['remote', 'get-url', 'origin'])
+                if result.returncode == 0:
+                    remote_url = result.stdout.decode('utf-8', 'replace').strip() or None
+        except (subprocess.TimeoutExpired, Exception):
+            return None
+        
+        self._remote_url = remote_url
+        self._remote_url_key = key
+        return remote_url
     
     def get_file_status(self, file_path: str) -> Optional[str]:
         """
@@ -149,23 +370,17 @@ class GitIntegration:
         Returns:
             Estado del archivo (M, A, D, R, C, U, etc.) o None
         """
-        if not self.is_git_repository():
+        if not self._locate_repository():
             return None
         
         try:
-            result = subprocess.run(
-                ['git', 'status', '--porcelain', '--', file_path],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=5
-            )
+            result = self._run_git(['status', '--porcelain', '--', file_path])
             
             if result.returncode == 0 and result.stdout.strip():
                 # El primer carácter indica el estado del staging area
                 # El segundo carácter indica el estado del working directory
                 status = result.stdout.strip().split()[0]
-                return status
+                return status.decode('ascii', 'replace')
             
             return None
             
@@ -182,21 +397,15 @@ class GitIntegration:
         Returns:
             Lista de commits recientes o None
         """
-        if not self.is_git_repository():
+        if not self._locate_repository():
             return None
         
         try:
-            result = subprocess.run(
-                ['git', 'log', f'-{limit}', '--pretty=format:%h|%s|%an|%ad', '--date=short'],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=10
-            )
+            result = self._run_git(['log', f'-{limit}', '--pretty=format:%h|%s|%an|%ad', '--date=short'], timeout=10)
             
             if result.returncode == 0:
                 commits = []
-                for line in result.stdout.strip().split('\n'):
+                for line in result.stdout.decode('utf-8', 'replace').strip().split('\n'):
                     if line:
                         parts = line.split('|')
                         if len(parts) >= 4:
@@ -4,14 +4,28 @@ Sistema principal de memoria que orquesta todas las funcionalidades.
 
 import json
 import os
+import shutil
+from bisect import bisect_right, insort
+from collections import Counter
+from itertools import islice
 from datetime import datetime, timezone
 from importlib import resources
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
-from jsonschema import validate, ValidationError
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
-from .entry import Entry
+try:
+    import fastjsonschema
+except ImportError:  # fastjsonschema es opcional: se valida con jsonschema
+    fastjsonschema = None
+
+from .. import __version__
+from .constants import ENTRY_TYPES, VALID_ENTRY_TYPES
+from .entry import Entry, now_iso, search_text
 from .git_integration import GitIntegration
+from .search_index import SearchIndex
+from .serialization import dumps_bytes, load_path, loads
 
 
 class MemorySystem:
@@ -24,18 +38,41 @@ class MemorySystem:
     - Validación de esquemas JSON
     - Integración automática con Git
     - Exportación para agentes LLM
+    
+    Las entradas se guardan en `entries/entries.json` (instantánea) más un
+    registro de cambios `entries/entries.jsonl` al que cada modificación añade
+    una línea. Cuando el registro crece por encima de `LOG_COMPACTION_RATIO`
+    veces la instantánea, se compacta reescribiendo `entries.json`.
     """
     
-    def __init__(self, project_root: str = ".", auto_git: bool = True):
+    # Tamaño relativo del registro (frente a la instantánea) que dispara la compactación
+    LOG_COMPACTION_RATIO = 1.5
+    
+    # Modos de durabilidad: sin fsync, fsync agrupado o fsync en cada escritura
+    DURABILITY_MODES = ("none", "batch", "strict")
+    # Escrituras del registro acumuladas antes de un fsync en modo "batch"
+    SYNC_BATCH_SIZE = 16
+    
+    def __init__(self, project_root: str = ".", auto_git: bool = True,
+                 flush_every: int = 1, durability: Optional[str] = None):
         """
         Inicializar sistema de memoria.
         
         Args:
             project_root: Ruta raíz del proyecto
             auto_git: Habilitar integración automática con Git
+            flush_every: Número de modificaciones acumuladas en memoria antes de
+                escribir entries.json (1 = escribir en cada modificación)
+            durability: "none" (sin fsync), "batch" (un fsync cada
+                `SYNC_BATCH_SIZE` escrituras y al cerrar) o "strict" (fsync en
+                cada escritura). Por defecto, `system.durability` de config.json
+        
+        Raises:
+            ValueError: Si el modo de durabilidad es inválido
         """
         self.project_root = Path(project_root).resolve()
         self.auto_git = auto_git
+        self.flush_every = max(1, int(flush_every))
         
         # Directorios del sistema
         self.entries_dir = self.project_root / "entries"
@@ -44,9 +81,58 @@ class MemorySystem:
         
         # Archivos del sistema
         self.entries_file = self.entries_dir / "entries.json"
+        self.entries_log = self.entries_dir / "entries.jsonl"
         self.schema_file = self.config_dir / "schema.json"
         self.config_file = self.config_dir / "config.json"
         
+        # Índice de búsqueda derivado de entries.json
+        self.search_index = SearchIndex(self.entries_dir / "index.sqlite")
+        
+        # Entradas cargadas en memoria. `_data_key` es la clave de los archivos
+        # que las respaldan; con `_dirty` hay cambios aún no escritos
+        self._data: Optional[Dict[str, Any]] = None
+        self._data_key: Optional[str] = None
+        self._dirty = False
+        self._pending_changes: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = []
+        self._writes = 0
+        # Descriptor de escritura del registro de cambios, abierto en la primera escritura
+        self._log_fd: Optional[int] = None
+        # Escrituras del registro aún sin fsync (modo "batch")
+        self._unsynced_writes = 0
+        # Se incrementa cada vez que cambian las entradas en memoria
+        self._generation = 0
+        
+        # Índices en memoria (id -> posición, tipo/etiqueta -> posiciones
+        # ordenadas en la lista de entradas, timestamp comparable por
+        # posición), válidos para una generación concreta de `_data`
+        self._index_key: Optional[int] = None
+        self._by_id: Dict[str, int] = {}
+        self._timestamps: List[Optional[str]] = []
+        # Texto de búsqueda por posición; se calcula en la primera búsqueda
+        self._search_texts: Optional[List[str]] = None
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_tag: Dict[str, List[int]] = {}
+        # Estadísticas calculadas para una generación de `_data`
+        self._stats: Optional[Tuple[int, Dict[str, Any]]] = None
+        
+        # config.json parseado, releído solo si cambia en disco
+        self._config: Any = None
+        self._config_key: Optional[Tuple[int, int]] = None
+        
+        # Validador compilado del esquema, reconstruido si cambia schema.json
+        self._validator: Optional[Callable[[Dict[str, Any]], Optional[Exception]]] = None
+        self._schema_key: Optional[int] = None
+        
+        # La durabilidad se fija antes de inicializar, porque la inicialización
+        # ya escribe entries.json (sin config.json todavía, se usa "none")
+        if durability is None:
+            durability = self._get_config_value("system.durability", "none")
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(
+                f"Modo de durabilidad inválido. Debe ser uno de: {list(self.DURABILITY_MODES)}"
+            )
+        self.durability = durability
+        
         # Inicializar directorios y archivos
         self._initialize_system()
         
@@ -74,19 +160,76 @@ class MemorySystem:
         except Exception:
             return None
 
-    def _validate_entry(self, entry: Entry) -> None:
-        """Validar una entrada contra el esquema JSON si está disponible.
+    def _schema_mtime(self) -> Optional[int]:
+        """Obtener el mtime de `config/schema.json` (None si no existe)."""
+        try:
+            return self.schema_file.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh_schema(self) -> None:
+        """Recargar el esquema y compilar su validador si cambió el archivo."""
+        key = self._schema_mtime()
+        if self._validator is not None and key == self._schema_key:
+            return
 
-        Levanta ValueError con un mensaje claro si la validación falla.
-        """
         schema = self._load_schema()
         if not schema:
+            self._validator = None
+            self._schema_key = None
+            return
+
+        self._validator = self._compile_validator(schema)
+        self._schema_key = key
+
+    @staticmethod
+    def _compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], Optional[Exception]]:
+        """
+        Compilar el esquema en una función que devuelve el error de validación o None.
+
+        Con `fastjsonschema` instalado el esquema se traduce a código Python;
+        si no está disponible o no admite el esquema, se usa `jsonschema`.
+        Ambas rutas dan el mismo resultado: ninguna comprueba `format` (como
+        `jsonschema` sin verificador de formatos) y los errores se describen
+        siempre con `jsonschema`, que expone el atributo `message`.
+        """
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+
+        def validate(instance: Dict[str, Any]) -> Optional[Exception]:
+            return best_match(validator.iter_errors(instance))
+
+        if fastjsonschema is not None:
+            try:
+                compiled = fastjsonschema.compile(schema, use_formats=False)
+            except fastjsonschema.JsonSchemaDefinitionException:
+                compiled = None
+            if compiled is not None:
+                def validate_fast(instance: Dict[str, Any]) -> Optional[Exception]:
+                    try:
+                        compiled(instance)
+                    except fastjsonschema.JsonSchemaValueException as exc:
+                        # Solo en el caso de error: mismo mensaje que sin fastjsonschema
+                        return validate(instance) or exc
+                    return None
+                return validate_fast
+        return validate
+
+    def _validate_entry_dict(self, entry_dict: Dict[str, Any]) -> None:
+        """Validar una entrada contra el esquema JSON si está disponible.
+
+        El validador se compila una sola vez y se reutiliza mientras no cambie
+        `config/schema.json`. Levanta ValueError con un mensaje claro si la
+        validación falla.
+        """
+        self._refresh_schema()
+        if self._validator is None:
             return  # Sin esquema, no validar
 
-        try:
-            validate(instance=entry.to_dict(), schema=schema)
-        except ValidationError as exc:
-            raise ValueError(f"Entrada inválida según schema.json: {exc.message}") from exc
+        error = self._validator(entry_dict)
+        if error is not None:
+            raise ValueError(f"Entrada inválida según schema.json: {error.message}") from error
 
     def _initialize_system(self) -> None:
         """Inicializar directorios y archivos del sistema."""
@@ -103,18 +246,27 @@ class MemorySystem:
         if not self.config_file.exists():
             self._initialize_config_file()
     
+    @staticmethod
+    def _fill_metadata(metadata: Dict[str, Any], total_entries: int) -> Dict[str, Any]:
+        """Completar los campos mínimos de metadata con un único timestamp."""
+        now = now_iso()
+        metadata.setdefault("created", now)
+        metadata.setdefault("version", __version__)
+        metadata.setdefault("total_entries", total_entries)
+        metadata.setdefault("last_updated", now)
+        return metadata
+    
     def _initialize_entries_file(self) -> None:
         """Inicializar archivo de entradas con estructura básica."""
         initial_data = {
-            "metadata": {
-                "created": datetime.now(timezone.utc).isoformat(),
-                "version": __import__('memoria_cursor').__version__,
-                "total_entries": 0,
-                "last_updated": datetime.now(timezone.utc).isoformat()
-            },
+            "metadata": self._fill_metadata({}, 0),
             "entries": []
         }
+        # Conservar un archivo existente (por ejemplo, corrupto) antes de reemplazarlo
+        self._maybe_backup()
         self._save_entries(initial_data)
+        # Releer desde disco para aplicar el registro de cambios si existe
+        self._data = None
     
     def _initialize_config_file(self) -> None:
         """Inicializar archivo de configuración por defecto."""
@@ -122,13 +274,16 @@ class MemorySystem:
             "project": {
                 "name": self.project_root.name,
                 "description": f"Proyecto {self.project_root.name}",
-                "version": __import__('memoria_cursor').__version__
+                "version": __version__
             },
             "system": {
                 "auto_git": self.auto_git,
                 "default_entry_type": "note",
                 "max_content_length": 10000,
-                "backup_enabled": True
+                "backup_enabled": True,
+                "backup_every_n_writes": 1,
+                "backup_keep": 10,
+                "durability": "none"
             },
             "export": {
                 "default_format": "markdown",
@@ -140,49 +295,268 @@ class MemorySystem:
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(default_config, f, indent=2, ensure_ascii=False)
     
-    def _load_entries(self) -> Dict[str, Any]:
-        """Cargar entradas desde el archivo JSON."""
+    def __enter__(self) -> 'MemorySystem':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Escribir los cambios pendientes y cerrar el registro de cambios."""
+        self.flush()
+        if self._unsynced_writes and self._log_fd is not None:
+            os.fsync(self._log_fd)
+            self._unsynced_writes = 0
+        self._close_log()
+        self.search_index.close()
+    
+    def __del__(self) -> None:
+        # Sin close() explícito, no perder los cambios acumulados en memoria.
+        # Los errores se ignoran: el objeto puede estar a medio construir o
+        # el intérprete cerrándose
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def flush(self) -> None:
+        """
+        Escribir en disco las modificaciones acumuladas en memoria.
+        
+        Los cambios se añaden al registro `entries.jsonl`; si este supera el
+        umbral de tamaño se compacta en `entries.json`.
+        """
+        if not self._dirty or self._data is None:
+            return
+        self._maybe_backup()
+        data = self._data
+        changes = self._pending_changes
+        previous_key = self._storage_key()
+        self._append_log(changes)
+        if self._log_needs_compaction():
+            self._write_snapshot(data)
+        else:
+            self._mark_clean()
+        self._update_search_index(previous_key, data, changes)
+    
+    def compact(self) -> None:
+        """Reescribir entries.json con todas las entradas y vaciar el registro de cambios."""
+        data = self._load_entries()
+        changes = self._pending_changes if self._dirty else []
+        self._maybe_backup()
+        previous_key = self._storage_key()
+        self._write_snapshot(data)
+        self._update_search_index(previous_key, data, changes)
+    
+    def _storage_key(self) -> Optional[str]:
+        """Clave de versión de la instantánea y el registro de cambios."""
+        snapshot_key = SearchIndex.source_key(self.entries_file)
+        log_key = SearchIndex.source_key(self.entries_log)
+        if snapshot_key is None or log_key is None:
+            return snapshot_key
+        return f"{snapshot_key}|{log_key}"
+    
+    def _mark_clean(self) -> None:
+        """Marcar las entradas en memoria como sincronizadas con el disco."""
+        self._data_key = self._storage_key()
+        self._dirty = False
+        self._pending_changes = []
+    
+    def _append_log(self, changes: List[Tuple[Optional[Dict[str, Any]], Optional[str]]]) -> None:
+        """Añadir al registro de cambios una línea JSON por modificación."""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        lines = []
+        for upsert, delete_id in changes:
+            if upsert is not None:
+                record = {"op": "put", "ts": timestamp, "entry": upsert}
+            else:
+                record = {"op": "del", "ts": timestamp, "id": delete_id}
+            lines.append(dumps_bytes(record, indent=False) + b"\n")
+        
+        # Un único write() con todas las líneas, sobre el descriptor ya abierto
+        fd = self._log_handle()
+        view = memoryview(b"".join(lines))
+        while view:
+            view = view[os.write(fd, view):]
+        if self.durability == "strict":
+            os.fsync(fd)
+        elif self.durability == "batch":
+            self._unsynced_writes += 1
+            if self._unsynced_writes >= self.SYNC_BATCH_SIZE:
+                os.fsync(fd)
+                self._unsynced_writes = 0
+    
+    def _log_handle(self) -> int:
+        """
+        Obtener el descriptor de escritura (modo append) del registro de cambios.
+        
+        Se reutiliza entre escrituras y se reabre si otro proceso compactó o
+        reemplazó el archivo.
+        """
+        if self._log_fd is not None:
+            try:
+                current = os.stat(self.entries_log)
+                opened = os.fstat(self._log_fd)
+                if (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+                    return self._log_fd
+            except OSError:
+                pass
+            self._close_log()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self._log_fd = os.open(self.entries_log, flags, 0o666)
+        return self._log_fd
+    
+    def _close_log(self) -> None:
+        """Cerrar el descriptor del registro de cambios si está abierto."""
+        fd = getattr(self, "_log_fd", None)
+        if fd is not None:
+            self._log_fd = None
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def _log_needs_compaction(self) -> bool:
+        """Indicar si el registro de cambios ya es grande frente a la instantánea."""
+        try:
+            log_size = self.entries_log.stat().st_size
+            snapshot_size = self.entries_file.stat().st_size
+        except OSError:
+            return True
+        return log_size > snapshot_size * self.LOG_COMPACTION_RATIO
+    
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        """Guardar la instantánea completa y eliminar el registro de cambios."""
+        self._save_entries(data)
+        self._close_log()
+        self._unsynced_writes = 0
+        try:
+            self.entries_log.unlink()
+        except FileNotFoundError:
+            pass
+        self._mark_clean()
+    
+    def _replay_log(self, data: Dict[str, Any]) -> None:
+        """Aplicar sobre la instantánea cargada los cambios del registro."""
         try:
-            with open(self.entries_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Asegurar estructura mínima válida
-                if not isinstance(data, dict):
-                    return {
-                        "metadata": {
-                            "created": datetime.now(timezone.utc).isoformat(),
-                            "version": __import__('memoria_cursor').__version__,
-                            "total_entries": 0,
-                            "last_updated": datetime.now(timezone.utc).isoformat(),
-                        },
-                        "entries": [],
-                    }
-                if not isinstance(data.get("entries"), list):
-                    data["entries"] = []
-                if not isinstance(data.get("metadata"), dict):
-                    data["metadata"] = {
-                        "created": datetime.now(timezone.utc).isoformat(),
-                        "version": __import__('memoria_cursor').__version__,
-                        "total_entries": len(data["entries"]),
-                        "last_updated": datetime.now(timezone.utc).isoformat(),
-                    }
+            with open(self.entries_log, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        
+        entries = data["entries"]
+        positions: Dict[Any, int] = {}
+        for position, entry_data in enumerate(entries):
+            positions.setdefault(entry_data.get("id") if isinstance(entry_data, dict) else None, position)
+        
+        last_updated = None
+        removed = False
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except ValueError:
+                continue  # Línea incompleta por una escritura interrumpida
+            if not isinstance(record, dict):
+                continue
+            if record.get("op") == "put" and isinstance(record.get("entry"), dict):
+                entry_data = record["entry"]
+                position = positions.get(entry_data.get("id"))
+                if position is None:
+                    positions[entry_data.get("id")] = len(entries)
+                    entries.append(entry_data)
                 else:
-                    md = data["metadata"]
-                    md.setdefault("created", datetime.now(timezone.utc).isoformat())
-                    md.setdefault("version", __import__('memoria_cursor').__version__)
-                    md.setdefault("total_entries", len(data["entries"]))
-                    md.setdefault("last_updated", datetime.now(timezone.utc).isoformat())
-                return data
+                    entries[position] = entry_data
+            elif record.get("op") == "del":
+                position = positions.pop(record.get("id"), None)
+                if position is not None:
+                    entries[position] = None
+                    removed = True
+            else:
+                continue
+            last_updated = record.get("ts") or last_updated
+        
+        if removed:
+            data["entries"] = [entry_data for entry_data in entries if entry_data is not None]
+        if last_updated is not None:
+            data["metadata"]["total_entries"] = len(data["entries"])
+            data["metadata"]["last_updated"] = last_updated
+    
+    def _commit_change(self, data: Dict[str, Any],
+                       upsert: Optional[Dict[str, Any]] = None,
+                       delete_id: Optional[str] = None) -> None:
+        """
+        Registrar una modificación de las entradas y escribirla si corresponde.
+        
+        Los índices en memoria que estuvieran al día siguen siéndolo: quien
+        modifica las entradas debe haberlos actualizado o invalidado antes.
+        """
+        indexed = self._index_key == self._generation
+        self._data = data
+        self._dirty = True
+        self._generation += 1
+        if indexed:
+            self._index_key = self._generation
+        self._pending_changes.append((upsert, delete_id))
+        if len(self._pending_changes) >= self.flush_every:
+            self.flush()
+    
+    def _load_entries(self) -> Dict[str, Any]:
+        """
+        Obtener las entradas, leyendo entries.json y su registro solo si es necesario.
+        
+        Se reutiliza la copia en memoria mientras los archivos no cambien por
+        fuera del sistema. Si hay cambios pendientes de escribir, la copia en
+        memoria prevalece sobre el archivo.
+        """
+        if self._data is not None:
+            if self._dirty or self._storage_key() == self._data_key:
+                return self._data
+        
+        key = self._storage_key()
+        try:
+            data = load_path(self.entries_file)
         except (FileNotFoundError, json.JSONDecodeError):
             # Si hay error, reinicializar el archivo
             self._initialize_entries_file()
             return self._load_entries()
+        
+        # Asegurar estructura mínima válida
+        if not isinstance(data, dict):
+            data = {"metadata": {}, "entries": []}
+        if not isinstance(data.get("entries"), list):
+            data["entries"] = []
+        if not isinstance(data.get("metadata"), dict):
+            data["metadata"] = {}
+        self._fill_metadata(data["metadata"], len(data["entries"]))
+        
+        self._replay_log(data)
+        
+        self._data = data
+        self._data_key = key
+        self._generation += 1
+        return data
+    
+    def _maybe_backup(self) -> None:
+        """
+        Crear un backup antes de una escritura, cada `backup_every_n_writes` escrituras.
+        
+        Cuenta las escrituras de entradas (cada `flush` o compactación), no
+        solo las reescrituras de entries.json.
+        """
+        if self._get_config_value("system.backup_enabled", True):
+            every = self._get_config_value("system.backup_every_n_writes", 1)
+            try:
+                every = max(1, int(every))
+            except (TypeError, ValueError):
+                every = 1
+            if self._writes % every == 0:
+                self._create_backup()
+        self._writes += 1
     
     def _save_entries(self, data: Dict[str, Any]) -> None:
         """Guardar entradas en el archivo JSON."""
-        # Crear backup si está habilitado
-        if self._get_config_value("system.backup_enabled", True):
-            self._create_backup()
-        
         # Normalizar estructura antes de guardar
         if not isinstance(data, dict):
             data = {"metadata": {}, "entries": []}
@@ -191,43 +565,101 @@ class MemorySystem:
         if not isinstance(data.get("metadata"), dict):
             data["metadata"] = {}
         # Asegurar campos mínimos en metadata
-        data["metadata"].setdefault("created", datetime.now(timezone.utc).isoformat())
-        data["metadata"].setdefault("version", __import__('memoria_cursor').__version__)
-        data["metadata"].setdefault("total_entries", len(data["entries"]))
-        data["metadata"].setdefault("last_updated", datetime.now(timezone.utc).isoformat())
+        self._fill_metadata(data["metadata"], len(data["entries"]))
 
-        with open(self.entries_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Sin sangría: entries.json no se edita a mano y así se escribe y lee
+        # más rápido (config.json conserva la sangría)
+        # Escribir en un temporal y reemplazar: el archivo anterior conserva su
+        # inodo, así que los backups por enlace duro no se ven modificados
+        tmp_file = self.entries_file.with_name(self.entries_file.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(dumps_bytes(data, indent=False))
+            # La instantánea se reescribe con poca frecuencia: se sincroniza
+            # siempre que haya durabilidad
+            if self.durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.entries_file)
+        
+        if data is not self._data:
+            self._generation += 1
+        self._data = data
+        self._mark_clean()
     
     def _create_backup(self) -> None:
-        """Crear backup del archivo de entradas."""
+        """
+        Crear backup del archivo de entradas.
+        
+        El backup de entries.json es un enlace duro al archivo actual (sin
+        copiar datos); si el sistema de archivos no lo admite se copia. Si hay
+        cambios en el registro aún no compactados, el registro se copia junto
+        al backup con extensión `.jsonl`. Solo se conservan los
+        `system.backup_keep` backups más recientes.
+        """
         if self.entries_file.exists():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             backup_file = self.entries_dir / f"entries_backup_{timestamp}.json"
             
             try:
-                with open(self.entries_file, 'r', encoding='utf-8') as src:
-                    with open(backup_file, 'w', encoding='utf-8') as dst:
-                        dst.write(src.read())
+                if backup_file.exists():
+                    backup_file.unlink()
+                try:
+                    os.link(self.entries_file, backup_file)
+                except OSError:
+                    shutil.copyfile(self.entries_file, backup_file)
+                # El registro se modifica en el sitio: copiarlo, no enlazarlo
+                if self.entries_log.exists() and self.entries_log.stat().st_size:
+                    shutil.copyfile(self.entries_log, backup_file.with_suffix(".jsonl"))
+                self._prune_backups()
             except Exception:
                 pass  # Silenciar errores de backup
     
+    def _prune_backups(self) -> None:
+        """Eliminar los backups más antiguos que excedan `system.backup_keep`."""
+        keep = self._get_config_value("system.backup_keep", 10)
+        try:
+            keep = max(1, int(keep))
+        except (TypeError, ValueError):
+            keep = 10
+        # El nombre incluye el timestamp, así que el orden alfabético es cronológico
+        backups = sorted(self.entries_dir.glob("entries_backup_*.json"))
+        for old_backup in backups[:-keep]:
+            for path in (old_backup, old_backup.with_suffix(".jsonl")):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+    
+    def _config_stat_key(self) -> Optional[Tuple[int, int]]:
+        """Clave de versión de config.json (mtime y tamaño; None si no existe)."""
+        try:
+            stat = self.config_file.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _get_config(self) -> Any:
+        """Obtener config.json parseado, releyéndolo solo si cambió en disco."""
+        key = self._config_stat_key()
+        if self._config is None or key != self._config_key:
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    self._config = json.load(f)
+            except Exception:
+                self._config = {}
+            self._config_key = key
+        return self._config
+    
     def _get_config_value(self, key_path: str, default: Any = None) -> Any:
         """Obtener valor de configuración usando notación de punto."""
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            value: Any = config
-            for key in key_path.split('.'):
-                if not isinstance(value, dict):
-                    return default
-                if key not in value:
-                    return default
-                value = value[key]
-            return value
-        except Exception:
-            return default
+        value: Any = self._get_config()
+        for key in key_path.split('.'):
+            if not isinstance(value, dict):
+                return default
+            if key not in value:
+                return default
+            value = value[key]
+        return value
     
     def create_entry(self, 
                     entry_type: str,
@@ -256,9 +688,8 @@ class MemorySystem:
             ValueError: Si el tipo de entrada es inválido
         """
         # Validar tipo de entrada
-        valid_types = ["decision", "change", "context", "bug", "feature", "note"]
-        if entry_type not in valid_types:
-            raise ValueError(f"Tipo de entrada inválido. Debe ser uno de: {valid_types}")
+        if entry_type not in VALID_ENTRY_TYPES:
+            raise ValueError(f"Tipo de entrada inválido. Debe ser uno de: {list(ENTRY_TYPES)}")
         
         # Enforce límites desde config
         max_len = int(self._get_config_value("system.max_content_length", 10000) or 10000)
@@ -284,8 +715,9 @@ class MemorySystem:
             if git_info:
                 entry.git_info = git_info
         
-        # Validar contra schema si está disponible
-        self._validate_entry(entry)
+        # Validar contra schema si está disponible (el mismo diccionario se guarda)
+        entry_dict = entry.to_dict()
+        self._validate_entry_dict(entry_dict)
 
         # Cargar datos existentes
         data = self._load_entries()
@@ -293,23 +725,60 @@ class MemorySystem:
         if not isinstance(data.get("entries"), list):
             data["entries"] = []
         if not isinstance(data.get("metadata"), dict):
-            data["metadata"] = {
-                "created": datetime.now(timezone.utc).isoformat(),
-                "version": __import__('memoria_cursor').__version__,
-                "total_entries": 0,
-                "last_updated": datetime.now(timezone.utc).isoformat(),
-            }
+            data["metadata"] = self._fill_metadata({}, 0)
         
         # Agregar nueva entrada
-        data["entries"].append(entry.to_dict())
+        data["entries"].append(entry_dict)
+        if self._index_key == self._generation:
+            self._index_entry(len(data["entries"]) - 1, entry_dict)
         data["metadata"]["total_entries"] = len(data["entries"])
         data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
         
         # Guardar datos
-        self._save_entries(data)
+        self._commit_change(data, upsert=entry_dict)
         
         return entry.entry_id
     
+    def create_entries(self, specs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Crear varias entradas escribiendo en disco una sola vez.
+        
+        Cada elemento de `specs` contiene los argumentos de `create_entry`.
+        Los cambios se acumulan en memoria y se escriben juntos al final,
+        con independencia de `flush_every`.
+        
+        Args:
+            specs: Lista de diccionarios con los argumentos de cada entrada
+            
+        Returns:
+            IDs de las entradas creadas, en el mismo orden
+            
+        Raises:
+            ValueError: Si alguna entrada es inválida (las anteriores se conservan)
+        """
+        flush_every = self.flush_every
+        self.flush_every = len(self._pending_changes) + len(specs) + 1
+        try:
+            return [self.create_entry(**spec) for spec in specs]
+        finally:
+            self.flush_every = flush_every
+            if len(self._pending_changes) >= flush_every:
+                self.flush()
+    
+    def refresh_git_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Volver a leer la información de Git que se adjunta a las entradas nuevas.
+        
+        Útil en procesos de larga duración para no esperar a que caduque la caché.
+        
+        Returns:
+            Información de Git actualizada o None si no está disponible
+        """
+        if not (self.auto_git and self.git_integration):
+            return None
+        self.git_integration.invalidate_cache()
+        return self.git_integration.get_git_info()
+    
     def get_entry(self, entry_id: str) -> Optional[Entry]:
         """
         Obtener una entrada específica por ID.
@@ -320,14 +789,16 @@ class MemorySystem:
         Returns:
             Objeto Entry o None si no se encuentra
         """
+        data, position = self._find_entry(entry_id)
+        if position is None:
+            return None
+        return Entry.from_dict(data["entries"][position])
+    
+    def _find_entry(self, entry_id: str) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Obtener las entradas y la posición de una entrada por ID (None si no existe)."""
         data = self._load_entries()
-        entries = data.get("entries", [])
-        
-        for entry_data in entries:
-            if entry_data.get("id") == entry_id:
-                return Entry.from_dict(entry_data)
-        
-        return None
+        by_id, _, _ = self._get_indexes(data.get("entries", []))
+        return data, by_id.get(entry_id)
     
     def list_entries(self,
                     limit: Optional[int] = None,
@@ -336,7 +807,8 @@ class MemorySystem:
                     tags: Optional[List[str]] = None,
                     search: Optional[str] = None,
                     date_from: Optional[str] = None,
-                    date_to: Optional[str] = None) -> List[Entry]:
+                    date_to: Optional[str] = None,
+                    after: Optional[str] = None) -> List[Entry]:
         """
         Listar entradas con filtros opcionales.
         
@@ -348,80 +820,258 @@ class MemorySystem:
             search: Buscar en título y contenido
             date_from: Fecha de inicio (YYYY-MM-DD)
             date_to: Fecha de fin (YYYY-MM-DD)
+            after: ID de la última entrada de la página anterior; la lista
+                continúa a partir de ella sin recorrer las anteriores
             
         Returns:
             Lista de entradas filtradas
+            
+        Raises:
+            ValueError: Si `after` no corresponde a ninguna entrada
+        """
+        return list(self.iter_entries(limit, offset, entry_type, tags, search, date_from, date_to, after))
+    
+    def iter_entries(self,
+                     limit: Optional[int] = None,
+                     offset: int = 0,
+                     entry_type: Optional[str] = None,
+                     tags: Optional[List[str]] = None,
+                     search: Optional[str] = None,
+                     date_from: Optional[str] = None,
+                     date_to: Optional[str] = None,
+                     after: Optional[str] = None) -> Iterator[Entry]:
+        """
+        Iterar sobre las entradas filtradas sin construir la lista completa.
+        
+        Acepta los mismos filtros que `list_entries`. Cada objeto Entry se
+        construye al pedirlo; las entradas no deben modificarse mientras se
+        recorre el iterador.
+        
+        Yields:
+            Entradas que cumplen los filtros
         """
         data = self._load_entries()
         entries_data = data.get("entries", [])
         
-        # Convertir a objetos Entry
-        entries = [Entry.from_dict(entry_data) for entry_data in entries_data]
-        
-        # Aplicar filtros
-        filtered_entries = entries
-        
-        # Filtrar por tipo
-        if entry_type:
-            filtered_entries = [
-                entry for entry in filtered_entries
-                if entry.entry_type == entry_type
-            ]
-        
-        # Filtrar por etiquetas
-        if tags:
-            filtered_entries = [
-                entry for entry in filtered_entries
-                if any(tag in entry.tags for tag in tags)
-            ]
-        
-        # Buscar en título y contenido
-        if search:
-            filtered_entries = [
-                entry for entry in filtered_entries
-                if entry.matches_search(search)
-            ]
-        
-        # Filtrar por fecha
-        if date_from or date_to:
-            filtered_entries = self._filter_by_date(filtered_entries, date_from, date_to)
-        
-        # Aplicar offset y límite
-        if offset > 0:
-            filtered_entries = filtered_entries[offset:]
-        
-        if limit:
-            filtered_entries = filtered_entries[:limit]
-        
-        return filtered_entries
-    
-    def _filter_by_date(self, entries: List[Entry], 
-                        date_from: Optional[str], 
-                        date_to: Optional[str]) -> List[Entry]:
-        """Filtrar entradas por rango de fechas."""
-        filtered = entries
-        
-        if date_from:
-            try:
-                date_from_dt = datetime.fromisoformat(date_from + "T00:00:00")
-                filtered = [
-                    entry for entry in filtered
-                    if datetime.fromisoformat(entry.timestamp) >= date_from_dt
-                ]
-            except ValueError:
-                pass
+        # Filtrar sobre posiciones con los índices en memoria, antes de
+        # construir objetos Entry para entradas que se descartarían
+        date_range = self._parse_date_range(date_from, date_to)
+        if entry_type or tags or date_range or search or after is not None:
+            by_id, by_type, by_tag = self._get_indexes(entries_data)
+            positions: Any = None
+            if entry_type:
+                positions = set(by_type.get(entry_type, ()))
+            if tags:
+                tagged = set()
+                for tag in tags:
+                    tagged.update(by_tag.get(tag, ()))
+                positions = tagged if positions is None else positions & tagged
+            positions = range(len(entries_data)) if positions is None else sorted(positions)
+            
+            # Paginación por cursor: continuar después de la entrada `after`
+            if after is not None:
+                cursor = by_id.get(after)
+                if cursor is None:
+                    raise ValueError(f"Entrada no encontrada: {after}")
+                positions = positions[bisect_right(positions, cursor):]
+            
+            # Los filtros se encadenan como generadores: con `limit` se
+            # detienen al reunir suficientes coincidencias
+            if date_range:
+                lower, upper = date_range
+                timestamps = self._timestamps
+                positions = (
+                    i for i in positions
+                    if timestamps[i] is not None and lower <= timestamps[i] <= upper
+                )
+            
+            if search:
+                # Preseleccionar candidatos con el índice de texto completo,
+                # que solo refleja lo escrito en disco
+                if not self._dirty:
+                    candidate_ids = self.search_index.search_ids(
+                        search, self._data_key, entries_data
+                    )
+                    if candidate_ids is not None:
+                        positions = (
+                            i for i in positions
+                            if entries_data[i].get("id") in candidate_ids
+                        )
+                # Buscar en título, contenido, contexto, etiquetas y archivos
+                needle = search.lower()
+                texts = self._get_search_texts(entries_data)
+                positions = (i for i in positions if needle in texts[i])
+        else:
+            positions = range(len(entries_data))
         
-        if date_to:
-            try:
-                date_to_dt = datetime.fromisoformat(date_to + "T23:59:59")
-                filtered = [
-                    entry for entry in filtered
-                    if datetime.fromisoformat(entry.timestamp) <= date_to_dt
-                ]
-            except ValueError:
-                pass
+        # Aplicar offset y límite antes de construir las entradas
+        start = max(offset, 0)
+        stop = start + limit if limit else None
+        positions = islice(positions, start, stop)
         
-        return filtered
+        for i in positions:
+            yield Entry.from_dict(entries_data[i])
+    
+    def _get_indexes(self, entries_data: List[Dict[str, Any]]
+                     ) -> Tuple[Dict[str, int], Dict[str, List[int]], Dict[str, List[int]]]:
+        """
+        Obtener los índices id -> posición, tipo -> posiciones y etiqueta -> posiciones.
+        
+        También mantiene `_timestamps`, el instante UTC de cada entrada como
+        string comparable (ver `_timestamp_key`), para no parsear fechas en cada
+        filtro. Se reconstruyen solo cuando cambian las entradas en memoria sin que las
+        modificaciones los hayan mantenido.
+        """
+        key = self._generation
+        if key != self._index_key:
+            self._by_id, self._by_type, self._by_tag = {}, {}, {}
+            self._timestamps = []
+            self._search_texts = None
+            for position, entry_data in enumerate(entries_data):
+                self._index_entry(position, entry_data)
+            self._index_key = key
+        return self._by_id, self._by_type, self._by_tag
+    
+    def _index_entry(self, position: int, entry_data: Dict[str, Any]) -> None:
+        """Agregar una entrada a los índices en memoria."""
+        # Con IDs duplicados se conserva la primera aparición
+        self._by_id.setdefault(entry_data.get("id"), position)
+        insort(self._by_type.setdefault(entry_data.get("type", ""), []), position)
+        for tag in set(entry_data.get("tags") or ()):
+            insort(self._by_tag.setdefault(tag, []), position)
+        timestamp = self._timestamp_key(entry_data.get("timestamp"))
+        if position == len(self._timestamps):
+            self._timestamps.append(timestamp)
+        else:
+            self._timestamps[position] = timestamp
+        if self._search_texts is not None:
+            text = self._entry_search_text(entry_data)
+            if position == len(self._search_texts):
+                self._search_texts.append(text)
+            else:
+                self._search_texts[position] = text
+    
+    @staticmethod
+    def _entry_search_text(entry_data: Dict[str, Any]) -> str:
+        """Texto de búsqueda de una entrada serializada (igual que `Entry.matches_search`)."""
+        return search_text(
+            entry_data.get("title", ""),
+            entry_data.get("content", ""),
+            entry_data.get("llm_context"),
+            entry_data.get("tags") or [],
+            entry_data.get("files_affected") or [],
+        )
+    
+    def _get_search_texts(self, entries_data: List[Dict[str, Any]]) -> List[str]:
+        """
+        Obtener el texto de búsqueda de cada posición.
+        
+        Requiere índices al día (`_get_indexes`); se calcula una vez y después
+        se mantiene junto con ellos.
+        """
+        if self._search_texts is None:
+            self._search_texts = [self._entry_search_text(d) for d in entries_data]
+        return self._search_texts
+    
+    def _unindex_entry(self, position: int, entry_data: Dict[str, Any]) -> None:
+        """Quitar de los índices en memoria una entrada que no cambia de posición."""
+        if self._by_id.get(entry_data.get("id")) == position:
+            del self._by_id[entry_data.get("id")]
+        entry_type = entry_data.get("type", "")
+        self._by_type[entry_type].remove(position)
+        if not self._by_type[entry_type]:
+            del self._by_type[entry_type]
+        for tag in set(entry_data.get("tags") or ()):
+            self._by_tag[tag].remove(position)
+            if not self._by_tag[tag]:
+                del self._by_tag[tag]
+    
+    def _update_search_index(self, previous_key: Optional[str], data: Dict[str, Any],
+                             changes: List[Tuple[Optional[Dict[str, Any]], Optional[str]]]) -> None:
+        """
+        Reflejar en el índice de búsqueda cambios ya escritos en disco.
+        
+        Un único cambio se aplica de forma incremental; con varios el índice se
+        reconstruye.
+        """
+        upsert, delete_id = changes[0] if len(changes) == 1 else (None, None)
+        self.search_index.apply(
+            previous_key if len(changes) <= 1 else None,
+            self._storage_key(),
+            data.get("entries", []),
+            upsert=upsert,
+            delete_id=delete_id,
+        )
+    
+    def rebuild_search_index(self) -> bool:
+        """
+        Reconstruir el índice de búsqueda desde entries.json.
+        
+        Returns:
+            True si el índice se reconstruyó, False si SQLite FTS5 no está disponible
+        """
+        self.flush()
+        data = self._load_entries()
+        return self.search_index.rebuild(data.get("entries", []), self._storage_key())
+    
+    @staticmethod
+    def _timestamp_key(value: Any) -> Optional[str]:
+        """
+        Convertir un timestamp ISO a un string UTC comparable (None si no es válido).
+        
+        El resultado tiene la forma `YYYY-MM-DDTHH:MM:SS.ffffff`, cuyo orden
+        lexicográfico coincide con el cronológico. Los timestamps en UTC que
+        genera el sistema (o sin zona horaria, que se interpretan en UTC) se
+        convierten recortando el string; el resto se parsea.
+        """
+        if not isinstance(value, str):
+            return None
+        if (len(value) >= 19 and value[4] == "-" and value[7] == "-" and value[10] == "T"
+                and value[13] == ":" and value[16] == ":" and value[:4].isdigit()):
+            suffix = value[19:]
+            if suffix.endswith("+00:00"):
+                suffix = suffix[:-6]
+            if not suffix:
+                return value[:19] + ".000000"
+            if len(suffix) == 7 and suffix[0] == "." and suffix[1:].isdigit():
+                return value[:19] + suffix
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment.isoformat(timespec="microseconds")
+    
+    @classmethod
+    def _parse_date_range(cls, date_from: Optional[str],
+                          date_to: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Parsear una sola vez los límites de fecha (YYYY-MM-DD) de una consulta.
+        
+        Returns:
+            Límites inferior y superior comparables con `_timestamp_key`, o None
+            si no hay filtro de fecha. Los límites ausentes o inválidos no restringen.
+        """
+        lower = cls._date_bound_key(date_from, "T00:00:00")
+        upper = cls._date_bound_key(date_to, "T23:59:59")
+        if lower is None and upper is None:
+            return None
+        # "" precede a cualquier clave y "~" sigue a cualquier dígito
+        return ("" if lower is None else lower, "~" if upper is None else upper)
+    
+    @staticmethod
+    def _date_bound_key(date: Optional[str], time_suffix: str) -> Optional[str]:
+        """Validar un límite de fecha y convertirlo en clave comparable."""
+        if not date:
+            return None
+        try:
+            moment = datetime.fromisoformat(date + time_suffix)
+        except ValueError:
+            return None
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment.isoformat(timespec="microseconds")
     
     def update_entry(self, entry_id: str, **kwargs) -> bool:
         """
@@ -434,9 +1084,11 @@ class MemorySystem:
         Returns:
             True si se actualizó correctamente, False en caso contrario
         """
-        entry = self.get_entry(entry_id)
-        if not entry:
+        data, position = self._find_entry(entry_id)
+        if position is None:
             return False
+        entries = data["entries"]
+        entry = Entry.from_dict(entries[position])
         
         # Actualizar campos permitidos
         allowed_fields = ['title', 'content', 'tags', 'files_affected', 'llm_context']
@@ -448,21 +1100,17 @@ class MemorySystem:
         # Actualizar timestamp
         entry.timestamp = datetime.now(timezone.utc).isoformat()
         
-        # Validar contra schema si está disponible
-        self._validate_entry(entry)
+        # Validar contra schema si está disponible (el mismo diccionario se guarda)
+        entry_dict = entry.to_dict()
+        self._validate_entry_dict(entry_dict)
 
-        # Guardar cambios
-        data = self._load_entries()
-        entries = data.get("entries", [])
-        
-        for i, entry_data in enumerate(entries):
-            if entry_data.get("id") == entry_id:
-                entries[i] = entry.to_dict()
-                data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
-                self._save_entries(data)
-                return True
-        
-        return False
+        # Guardar cambios, manteniendo los índices en memoria
+        self._unindex_entry(position, entries[position])
+        entries[position] = entry_dict
+        self._index_entry(position, entry_dict)
+        data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+        self._commit_change(data, upsert=entry_dict)
+        return True
     
     def delete_entry(self, entry_id: str) -> bool:
         """
@@ -474,57 +1122,61 @@ class MemorySystem:
         Returns:
             True si se eliminó correctamente, False en caso contrario
         """
-        data = self._load_entries()
-        entries = data.get("entries", [])
-        
-        for i, entry_data in enumerate(entries):
-            if entry_data.get("id") == entry_id:
-                del entries[i]
-                data["metadata"]["total_entries"] = len(entries)
-                data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
-                self._save_entries(data)
-                return True
+        data, position = self._find_entry(entry_id)
+        if position is None:
+            return False
         
-        return False
+        entries = data["entries"]
+        del entries[position]
+        # Las posiciones posteriores se desplazan: los índices se reconstruyen
+        # en la próxima consulta
+        self._index_key = None
+        data["metadata"]["total_entries"] = len(entries)
+        data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+        self._commit_change(data, delete_id=entry_id)
+        return True
     
     def get_statistics(self) -> Dict[str, Any]:
         """
         Obtener estadísticas del sistema de memoria.
         
+        Se recalculan solo cuando cambian las entradas; mientras tanto se
+        devuelve una copia del último resultado.
+        
         Returns:
             Diccionario con estadísticas del sistema
         """
         data = self._load_entries()
+        if self._stats is None or self._stats[0] != self._generation:
+            self._stats = (self._generation, self._compute_statistics(data))
+        stats = self._stats[1]
+        return {
+            **stats,
+            "by_type": dict(stats["by_type"]),
+            "by_date": dict(stats["by_date"]),
+            "total_tags": list(stats["total_tags"]),
+        }
+    
+    def _compute_statistics(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Calcular las estadísticas recorriendo todas las entradas."""
         entries = data.get("entries", [])
         
-        stats = {
+        # Las etiquetas únicas salen del índice etiqueta -> posiciones
+        _, _, by_tag = self._get_indexes(entries)
+        metadata = data.get("metadata", {})
+        
+        return {
             "total_entries": len(entries),
-            "by_type": {},
-            "by_date": {},
-            "total_tags": set(),
-            "created": data.get("metadata", {}).get("created"),
-            "last_updated": data.get("metadata", {}).get("last_updated")
+            "by_type": dict(Counter(entry.get("type", "unknown") for entry in entries)),
+            # Estadísticas por fecha (YYYY-MM-DD)
+            "by_date": dict(Counter(
+                timestamp[:10] for timestamp in (entry.get("timestamp", "") for entry in entries)
+                if timestamp
+            )),
+            "total_tags": list(by_tag),
+            "created": metadata.get("created"),
+            "last_updated": metadata.get("last_updated")
         }
-        
-        # Estadísticas por tipo
-        for entry in entries:
-            entry_type = entry.get("type", "unknown")
-            stats["by_type"][entry_type] = stats["by_type"].get(entry_type, 0) + 1
-            
-            # Estadísticas por fecha
-            timestamp = entry.get("timestamp", "")
-            if timestamp:
-                date = timestamp[:10]  # YYYY-MM-DD
-                stats["by_date"][date] = stats["by_date"].get(date, 0) + 1
-            
-            # Total de etiquetas únicas
-            tags = entry.get("tags", [])
-            stats["total_tags"].update(tags)
-        
-        # Convertir set a lista para serialización JSON
-        stats["total_tags"] = list(stats["total_tags"])
-        
-        return stats
     
     def export_entries(self, 
                       output_format: str = "markdown",
@@ -582,6 +1234,9 @@ class MemorySystem:
             
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
+            
+            self._config = config
+            self._config_key = self._config_stat_key()
                 
         except Exception:
             pass
@@ -0,0 +1,199 @@
+"""
+Índice de búsqueda de texto completo (SQLite FTS5) derivado de entries.json.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set
+
+
+class SearchIndex:
+    """
+    Índice SQLite FTS5 para acelerar las búsquedas por texto.
+
+    El archivo JSON de entradas sigue siendo la fuente de verdad: el índice
+    guarda una clave del archivo (mtime y tamaño) y se reconstruye si deja de
+    coincidir. Usa el tokenizador `trigram`, que permite búsquedas por
+    subcadena sin distinguir mayúsculas; los términos de menos de tres
+    caracteres o no ASCII no se resuelven con el índice.
+
+    Mantiene una única conexión abierta. Como el índice es un dato derivado
+    que se reconstruye si no coincide con las entradas, usa WAL con
+    `synchronous=NORMAL`: las escrituras no fuerzan un fsync por transacción.
+    """
+
+    MIN_TERM_LENGTH = 3
+
+    def __init__(self, index_file: Path):
+        """
+        Inicializar índice de búsqueda.
+
+        Args:
+            index_file: Ruta del archivo SQLite del índice
+        """
+        self.index_file = Path(index_file)
+        self._available: Optional[bool] = None
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Obtener la conexión, abriéndola y preparando el esquema la primera vez."""
+        if self._conn is not None:
+            return self._conn
+        conn = sqlite3.connect(str(self.index_file))
+        try:
+            self._setup(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _setup(conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5("
+            "id UNINDEXED, title, content, llm_context, tags, files, "
+            "tokenize='trigram')"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self) -> None:
+        """Cerrar la conexión con el índice (se reabre al volver a usarlo)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def is_available(self) -> bool:
+        """Verificar si SQLite dispone de FTS5 con el tokenizador trigram."""
+        if self._available is None:
+            try:
+                conn = sqlite3.connect(":memory:")
+                try:
+                    conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+                finally:
+                    conn.close()
+                self._available = True
+            except sqlite3.Error:
+                self._available = False
+        return self._available
+
+    @staticmethod
+    def source_key(entries_file: Path) -> Optional[str]:
+        """Calcular la clave de versión del archivo de entradas."""
+        try:
+            stat = entries_file.stat()
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    @staticmethod
+    def _row(entry_data: Dict[str, Any]) -> tuple:
+        return (
+            entry_data.get("id"),
+            entry_data.get("title", ""),
+            entry_data.get("content", ""),
+            entry_data.get("llm_context") or "",
+            "\n".join(entry_data.get("tags") or ()),
+            "\n".join(entry_data.get("files_affected") or ()),
+        )
+
+    def _stored_key(self, conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_key(conn: sqlite3.Connection, key: Optional[str]) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (key,))
+
+    @staticmethod
+    def _fill(conn: sqlite3.Connection, entries_data: List[Dict[str, Any]]) -> None:
+        conn.execute("DELETE FROM entries_fts")
+        conn.executemany(
+            "INSERT INTO entries_fts (id, title, content, llm_context, tags, files) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (SearchIndex._row(entry_data) for entry_data in entries_data),
+        )
+
+    def rebuild(self, entries_data: List[Dict[str, Any]], key: Optional[str]) -> bool:
+        """
+        Reconstruir el índice completo.
+
+        Args:
+            entries_data: Entradas serializadas (diccionarios)
+            key: Clave de versión del archivo de entradas
+
+        Returns:
+            True si el índice se reconstruyó correctamente
+        """
+        if not self.is_available():
+            return False
+        try:
+            conn = self._connect()
+            with conn:
+                self._fill(conn, entries_data)
+                self._set_key(conn, key)
+            return True
+        except sqlite3.Error:
+            self.close()
+            return False
+
+    def apply(self, previous_key: Optional[str], new_key: Optional[str],
+              entries_data: List[Dict[str, Any]],
+              upsert: Optional[Dict[str, Any]] = None,
+              delete_id: Optional[str] = None) -> None:
+        """
+        Reflejar una modificación de entries.json en el índice.
+
+        Si el índice estaba al día con `previous_key` se aplica solo el cambio;
+        en caso contrario se reconstruye a partir de `entries_data`.
+        """
+        if not self.is_available():
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                if previous_key is None or self._stored_key(conn) != previous_key:
+                    self._fill(conn, entries_data)
+                else:
+                    entry_id = upsert.get("id") if upsert else delete_id
+                    conn.execute("DELETE FROM entries_fts WHERE id = ?", (entry_id,))
+                    if upsert:
+                        conn.execute(
+                            "INSERT INTO entries_fts (id, title, content, llm_context, tags, files) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            self._row(upsert),
+                        )
+                self._set_key(conn, new_key)
+        except sqlite3.Error:
+            self.close()
+
+    def search_ids(self, search_term: str, key: Optional[str],
+                   entries_data: List[Dict[str, Any]]) -> Optional[Set[str]]:
+        """
+        Obtener los IDs candidatos para un término de búsqueda.
+
+        Los candidatos son un superconjunto de las coincidencias de
+        `Entry.matches_search`, que debe aplicarse igualmente.
+
+        Returns:
+            Conjunto de IDs o None si el índice no puede resolver la búsqueda
+        """
+        if (not self.is_available() or key is None
+                or len(search_term) < self.MIN_TERM_LENGTH or not search_term.isascii()):
+            return None
+        try:
+            conn = self._connect()
+            if self._stored_key(conn) != key:
+                with conn:
+                    self._fill(conn, entries_data)
+                    self._set_key(conn, key)
+            query = '"' + search_term.replace('"', '""') + '"'
+            rows = conn.execute(
+                "SELECT id FROM entries_fts WHERE entries_fts MATCH ?", (query,)
+            ).fetchall()
+            return {row[0] for row in rows}
+        except sqlite3.Error:
+            self.close()
+            return None
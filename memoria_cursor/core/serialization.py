@@ -0,0 +1,96 @@
+"""
+Serialización JSON del sistema de memoria.
+
+Usa `orjson` si está instalado y recurre a la librería estándar `json` en caso
+contrario. Ambas rutas producen el mismo formato (UTF-8 sin escapar, sangría de
+dos espacios).
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: se usa json de la librería estándar
+    orjson = None
+
+
+def dumps_bytes(data: Any, indent: bool = True) -> bytes:
+    """
+    Serializar datos a JSON codificado en UTF-8.
+
+    Args:
+        data: Objeto serializable
+        indent: Usar sangría de dos espacios
+
+    Returns:
+        JSON como bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return dumps(data, indent=indent).encode('utf-8')
+
+
+def dumps(data: Any, indent: bool = True) -> str:
+    """
+    Serializar datos a un string JSON.
+
+    Args:
+        data: Objeto serializable
+        indent: Usar sangría de dos espacios
+
+    Returns:
+        JSON como string
+    """
+    if orjson is not None:
+        return dumps_bytes(data, indent=indent).decode('utf-8')
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Deserializar JSON desde bytes o string.
+
+    Raises:
+        json.JSONDecodeError: Si el contenido no es JSON válido
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+# Por debajo de este tamaño read() es igual o más rápido que crear el mapeo
+# (medido con orjson: el mapeo solo compensa a partir de algunos cientos de KB)
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def load_path(path: Union[str, 'os.PathLike[str]']) -> Any:
+    """
+    Leer y deserializar un archivo JSON.
+
+    Los archivos grandes se mapean en memoria (solo lectura) y se pasan al
+    parser sin copiarlos a un buffer intermedio.
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        json.JSONDecodeError: Si el contenido no es JSON válido
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return loads(view)
+            finally:
+                view.release()
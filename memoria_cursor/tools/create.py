@@ -3,6 +3,7 @@ Herramienta para crear entradas en el sistema de memoria.
 """
 
 from typing import List, Optional
+from ..core.constants import ENTRY_TYPES, VALID_ENTRY_TYPES
 from ..core.memory_system import MemorySystem
 
 
@@ -34,16 +35,17 @@ def create_entry(project_root: str = ".",
         ValueError: Si el tipo de entrada es inválido o faltan campos requeridos
     """
     # Validar campos requeridos
-    if not title.strip():
+    title = title.strip()
+    if not title:
         raise ValueError("El título es obligatorio")
     
-    if not content.strip():
+    content = content.strip()
+    if not content:
         raise ValueError("El contenido es obligatorio")
     
     # Validar tipo de entrada
-    valid_types = ["decision", "change", "context", "bug", "feature", "note"]
-    if entry_type not in valid_types:
-        raise ValueError(f"Tipo de entrada inválido. Debe ser uno de: {valid_types}")
+    if entry_type not in VALID_ENTRY_TYPES:
+        raise ValueError(f"Tipo de entrada inválido. Debe ser uno de: {list(ENTRY_TYPES)}")
     
     # Inicializar sistema de memoria
     memory_system = MemorySystem(project_root)
@@ -51,8 +53,8 @@ def create_entry(project_root: str = ".",
     # Crear entrada
     entry_id = memory_system.create_entry(
         entry_type=entry_type,
-        title=title.strip(),
-        content=content.strip(),
+        title=title,
+        content=content,
         tags=tags or [],
         files_affected=files_affected or [],
         llm_context=llm_context.strip() if llm_context else None,
@@ -62,6 +64,11 @@ def create_entry(project_root: str = ".",
     return entry_id
 
 
+def _split_csv(value: str) -> List[str]:
+    """Separar una lista de valores separados por comas, descartando vacíos."""
+    return [item for item in (part.strip() for part in value.split(",")) if item]
+
+
 def create_entry_interactive(project_root: str = ".") -> str:
     """
     Crear entrada de forma interactiva solicitando datos al usuario.
@@ -105,13 +112,16 @@ def create_entry_interactive(project_root: str = ".") -> str:
     # Solicitar contenido
     print("\nContenido de la entrada (presiona Enter dos veces para terminar):")
     content_lines = []
+    previous_empty = False
     while True:
         line = input()
-        if line == "" and content_lines and content_lines[-1] == "":
+        if line == "" and previous_empty:
+            content_lines.pop()  # Remover la línea vacía anterior
             break
         content_lines.append(line)
+        previous_empty = line == ""
     
-    content = "\n".join(content_lines[:-1])  # Remover línea vacía final
+    content = "\n".join(content_lines)
     
     if not content.strip():
         print("❌ El contenido es obligatorio.")
@@ -119,11 +129,11 @@ def create_entry_interactive(project_root: str = ".") -> str:
     
     # Solicitar etiquetas
     tags_input = input("\nEtiquetas (separadas por comas): ").strip()
-    tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()] if tags_input else []
+    tags = _split_csv(tags_input)
     
     # Solicitar archivos afectados
     files_input = input("\nArchivos afectados (separados por comas): ").strip()
-    files_affected = [file.strip() for file in files_input.split(",") if file.strip()] if files_input else []
+    files_affected = _split_csv(files_input)
     
     # Solicitar contexto LLM
     llm_context = input("\nContexto específico para LLM (opcional): ").strip()
@@ -132,7 +142,7 @@ def create_entry_interactive(project_root: str = ".") -> str:
     
     # Solicitar entradas relacionadas
     related_input = input("\nIDs de entradas relacionadas (separados por comas): ").strip()
-    related_entries = [entry_id.strip() for entry_id in related_input.split(",") if entry_id.strip()] if related_input else []
+    related_entries = _split_csv(related_input)
     
     # Crear entrada
     try:
@@ -2,13 +2,63 @@
 Herramienta para exportar entradas del sistema de memoria en formatos optimizados para LLM.
 """
 
-import json
+import mmap
+import os
+import re
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, Union
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken es opcional: se usa la heurística de caracteres
+    tiktoken = None
 
 from ..core.memory_system import MemorySystem
 from ..core.entry import Entry
+from ..core.serialization import dumps_bytes
+
+# Heurística de tokens: ~4 caracteres por token. Se usa cuando `tiktoken` no
+# está instalado; con tiktoken la proporción se mide sobre el contenido.
+CHARS_PER_TOKEN = 4
+
+# Codificación de tiktoken usada para contar tokens
+TOKEN_ENCODING = "cl100k_base"
+
+# Tamaño del buffer de escritura de las exportaciones (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# A partir de este tamaño estimado la salida se escribe sobre un archivo mapeado
+MMAP_WRITE_THRESHOLD = 4 * 1024 * 1024
+
+# Inicios de entrada en los que se prefiere dividir una exportación en partes
+# ('\n### ', '\nENTRADA:' o '\n---\n'). La anticipación consume solo el salto
+# de línea, de modo que también se encuentran separadores solapados.
+_CHUNK_SEPARATOR_RE = re.compile(r"\n(?=(### |ENTRADA:|---\n))")
+_MIN_SEPARATOR_LENGTH = 5
+
+# Separador entre entradas de la exportación en texto plano
+_TEXT_SEPARATOR = "=" * 60 + "\n\n"
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(name: str) -> Any:
+    """Obtener una codificación de tiktoken, o None si no está disponible."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:  # p. ej. sin acceso a los archivos de la codificación
+        return None
+
+
+@lru_cache(maxsize=128)
+def _underline(length: int) -> str:
+    """Línea de guiones para subrayar un título de `length` caracteres."""
+    return "-" * length + "\n\n"
 
 
 class LLMExporter:
@@ -21,16 +71,33 @@ class LLMExporter:
     - Text: Formato simple de texto plano
     """
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: Union[str, Path] = "."):
         """
         Inicializar exportador.
         
         Args:
             project_root: Ruta raíz del proyecto
         """
-        self.project_root = Path(project_root).resolve()
-        self.export_dir = self.project_root / "export"
-        self.export_dir.mkdir(exist_ok=True)
+        self._raw_root = project_root
+        self._project_root: Optional[Path] = None
+        self._export_dir: Optional[Path] = None
+    
+    @property
+    def project_root(self) -> Path:
+        """Ruta raíz del proyecto (las rutas relativas se resuelven en el primer uso)."""
+        if self._project_root is None:
+            root = Path(self._raw_root)
+            self._project_root = root if root.is_absolute() else root.resolve()
+        return self._project_root
+    
+    @property
+    def export_dir(self) -> Path:
+        """Directorio de exportación (se crea en el primer uso)."""
+        if self._export_dir is None:
+            export_dir = self.project_root / "export"
+            export_dir.mkdir(exist_ok=True)
+            self._export_dir = export_dir
+        return self._export_dir
     
     def export_for_llm(self, 
                       output_format: str = "markdown",
@@ -53,6 +120,11 @@ class LLMExporter:
             include_git: Incluir información de Git
             group_by: Agrupar por (type, date, tags)
             limit: Número máximo de entradas a exportar
+            chunked: Dividir la exportación en múltiples archivos
+            max_chars: Máximo de caracteres por archivo
+            max_tokens: Máximo de tokens por archivo (se convierte a caracteres
+                con la proporción medida por tiktoken si está instalado, o
+                con `CHARS_PER_TOKEN`)
             
         Returns:
             Ruta del archivo exportado
@@ -80,173 +152,259 @@ class LLMExporter:
         if limit is None:
             try:
                 max_entries = int(memory_system._get_config_value("export.max_entries_per_export", 0) or 0)
-                if max_entries > 0:
+                if 0 < max_entries < len(entries):
                     entries = entries[-max_entries:]
             except Exception:
                 pass
 
-        # Calcular límites de chunking
-        effective_max_chars = 0
-        if max_tokens and max_tokens > 0:
-            # Aproximación: 1 token ~ 4 chars (heurística)
-            effective_max_chars = max(effective_max_chars, max_tokens * 4)
-        if max_chars and max_chars > 0:
-            effective_max_chars = max(effective_max_chars, max_chars)
+        # Límites de chunking (los tokens se convierten al conocer el contenido)
+        max_chars = max_chars if max_chars and max_chars > 0 else 0
+        max_tokens = max_tokens if max_tokens and max_tokens > 0 else 0
 
-        # Generar nombre de archivo base
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"memory_export_{timestamp}"
+        # Generar nombre de archivo base (misma hora que la cabecera del documento)
+        now = datetime.now()
+        generated_at = now.isoformat()
+        filename = f"memory_export_{now.strftime('%Y%m%d_%H%M%S')}"
         
         # Exportar según formato
         if output_format == "markdown":
-            return self._export_markdown(entries, filename, include_git, group_by, chunked, effective_max_chars)
+            return self._export_markdown(entries, filename, include_git, group_by, chunked,
+                                         max_chars, generated_at, max_tokens)
         elif output_format == "json":
-            return self._export_json(entries, filename, include_git)
+            return self._export_json(entries, filename, include_git, generated_at)
         elif output_format == "text":
-            return self._export_text(entries, filename, include_git, group_by, chunked, effective_max_chars)
+            return self._export_text(entries, filename, include_git, group_by, chunked,
+                                     max_chars, generated_at, max_tokens)
         else:
             raise ValueError(f"Formato no soportado: {output_format}")
 
     def _export_markdown(self, entries: List[Entry], 
                         filename: str, include_git: bool, group_by: str,
-                        chunked: bool, max_chars: int) -> str:
+                        chunked: bool, max_chars: int, generated_at: Optional[str] = None,
+                        max_tokens: int = 0) -> str:
         """Exportar en formato Markdown."""
-        content = self._build_markdown_content(entries, include_git, group_by)
-        if chunked and max_chars and max_chars > 0:
-            return self._write_chunked(filename, content, "md", max_chars)
+        if chunked and (max_chars > 0 or max_tokens > 0):
+            content = self._build_markdown_content(entries, include_git, group_by, generated_at)
+            return self._write_chunked(filename, content, "md",
+                                       self._chunk_char_limit(content, max_chars, max_tokens))
+        # Sin división: escribir cada fragmento a disco sin acumular el documento
         output_file = self.export_dir / f"{filename}.md"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_stream(output_file, self._iter_markdown_content(entries, include_git, group_by, generated_at),
+                           self._estimate_size(entries))
         return str(output_file)
     
-    def _export_json(self, entries: List[Entry], filename: str, include_git: bool) -> str:
-        """Exportar en formato JSON."""
+    def _export_json(self, entries: List[Entry], filename: str, include_git: bool,
+                     generated_at: Optional[str] = None) -> str:
+        """
+        Exportar en formato JSON.
+        
+        Las entradas se serializan y escriben una a una, sin construir el
+        documento completo en memoria. El resultado es el mismo que con
+        `json.dump(..., indent=2)`.
+        """
         output_file = self.export_dir / f"{filename}.json"
         
-        # Preparar datos para exportación
-        export_data = {
-            "metadata": {
-                "exported_at": datetime.now().isoformat(),
-                "project": self.project_root.name,
-                "total_entries": len(entries),
-                "format": "json",
-                "include_git": include_git
-            },
-            "entries": []
+        metadata = {
+            "exported_at": generated_at or datetime.now().isoformat(),
+            "project": self.project_root.name,
+            "total_entries": len(entries),
+            "format": "json",
+            "include_git": include_git
         }
         
-        for entry in entries:
-            entry_data = entry.to_dict()
-            
-            # Remover información de Git si no se incluye
-            if not include_git and "git_info" in entry_data:
-                del entry_data["git_info"]
-            
-            export_data["entries"].append(entry_data)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        # Las cadenas JSON no contienen saltos de línea literales, así que
+        # basta con desplazar cada línea para anidar un documento
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(b'{\n  "metadata": ' + dumps_bytes(metadata).replace(b'\n', b'\n  '))
+            f.write(b',\n  "entries": [')
+            separator = b'\n    '
+            for entry in entries:
+                entry_data = entry.to_dict()
+                
+                # Remover información de Git si no se incluye
+                if not include_git:
+                    entry_data.pop("git_info", None)
+                
+                f.write(separator)
+                f.write(dumps_bytes(entry_data).replace(b'\n', b'\n    '))
+                separator = b',\n    '
+            f.write(b'\n  ]\n}' if entries else b']\n}')
         
         return str(output_file)
     
     def _export_text(self, entries: List[Entry], filename: str, include_git: bool, group_by: str,
-                     chunked: bool, max_chars: int) -> str:
+                     chunked: bool, max_chars: int, generated_at: Optional[str] = None,
+                     max_tokens: int = 0) -> str:
         """Exportar en formato texto plano."""
-        content = self._build_text_content(entries, include_git, group_by)
-        if chunked and max_chars and max_chars > 0:
-            return self._write_chunked(filename, content, "txt", max_chars)
+        if chunked and (max_chars > 0 or max_tokens > 0):
+            content = self._build_text_content(entries, include_git, group_by, generated_at)
+            return self._write_chunked(filename, content, "txt",
+                                       self._chunk_char_limit(content, max_chars, max_tokens))
+        # Sin división: escribir cada fragmento a disco sin acumular el documento
         output_file = self.export_dir / f"{filename}.txt"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_stream(output_file, self._iter_text_content(entries, include_git, group_by, generated_at),
+                           self._estimate_size(entries))
         return str(output_file)
 
-    def _build_markdown_content(self, entries: List[Entry], include_git: bool, group_by: str) -> str:
-        parts: List[str] = []
-        parts.append("# Memoria del Proyecto - Exportación para LLM\n\n")
-        parts.append(f"**Generado:** {datetime.now().isoformat()}\n")
-        parts.append(f"**Total de entradas:** {len(entries)}\n")
-        parts.append(f"**Proyecto:** {self.project_root.name}\n\n")
+    @staticmethod
+    def _chunk_char_limit(content: str, max_chars: int, max_tokens: int) -> int:
+        """
+        Calcular el máximo de caracteres por parte.
+        
+        `max_tokens` se convierte a caracteres con la proporción
+        caracteres/token del contenido medida con tiktoken (una sola pasada
+        del tokenizador), o con `CHARS_PER_TOKEN` si no está disponible. Se
+        usa el mayor de los dos límites.
+        """
+        if max_tokens <= 0:
+            return max_chars
+        chars_per_token: float = CHARS_PER_TOKEN
+        encoding = _get_encoding(TOKEN_ENCODING)
+        if encoding is not None and content:
+            token_count = len(encoding.encode_ordinary(content))
+            if token_count:
+                chars_per_token = len(content) / token_count
+        return max(max_chars, int(max_tokens * chars_per_token))
+    
+    @staticmethod
+    def _estimate_size(entries: List[Entry]) -> int:
+        """Estimar el tamaño de la exportación (caracteres) para reservar espacio."""
+        return sum(
+            len(entry.title) + len(entry.content) + len(entry.llm_context or "") + 256
+            for entry in entries
+        )
+
+    @staticmethod
+    def _write_text_file(output_file: Path, text: str) -> None:
+        """Escribir un documento ya construido con una única escritura binaria."""
+        if os.linesep != '\n':
+            text = text.replace('\n', os.linesep)
+        output_file.write_bytes(text.encode('utf-8'))
+    
+    def _write_stream(self, output_file: Path, chunks: Iterable[str], size_hint: int) -> None:
+        """
+        Escribir fragmentos de texto en un archivo.
+
+        Para salidas pequeñas codifica los fragmentos en un único buffer y lo
+        escribe de una vez. Si el tamaño estimado supera `MMAP_WRITE_THRESHOLD`,
+        preasigna el archivo, escribe sobre un mapeo en memoria (ampliándolo si
+        hace falta) y lo trunca al tamaño real al terminar, sin acumular el
+        documento.
+        """
+        translate = os.linesep != '\n'
+        if size_hint < MMAP_WRITE_THRESHOLD:
+            buffer = bytearray()
+            for chunk in chunks:
+                if translate:
+                    chunk = chunk.replace('\n', os.linesep)
+                buffer += chunk.encode('utf-8')
+            output_file.write_bytes(buffer)
+            return
+
+        with open(output_file, 'w+b') as f:
+            capacity = size_hint
+            f.truncate(capacity)
+            mapped = mmap.mmap(f.fileno(), capacity)
+            position = 0
+            try:
+                for chunk in chunks:
+                    if translate:
+                        chunk = chunk.replace('\n', os.linesep)
+                    data = chunk.encode('utf-8')
+                    end = position + len(data)
+                    if end > capacity:
+                        capacity = max(end, capacity * 2)
+                        mapped.close()
+                        f.truncate(capacity)
+                        mapped = mmap.mmap(f.fileno(), capacity)
+                    mapped[position:end] = data
+                    position = end
+                mapped.flush()
+            finally:
+                # Recortar al tamaño escrito también si la generación falla,
+                # para no dejar el relleno preasignado al final del archivo
+                mapped.close()
+                f.truncate(position)
+
+    def _iter_markdown_content(self, entries: List[Entry], include_git: bool, group_by: str,
+                               generated_at: Optional[str] = None) -> Iterator[str]:
+        """Generar el contenido Markdown por fragmentos (encabezados y entradas)."""
+        yield "# Memoria del Proyecto - Exportación para LLM\n\n"
+        yield f"**Generado:** {generated_at or datetime.now().isoformat()}\n"
+        yield f"**Total de entradas:** {len(entries)}\n"
+        yield f"**Proyecto:** {self.project_root.name}\n\n"
 
         if group_by == "type":
             grouped = self._group_by_type(entries)
             for entry_type, type_entries in grouped.items():
-                parts.append(f"## {entry_type.upper()}\n\n")
+                yield f"## {entry_type.upper()}\n\n"
                 for entry in type_entries:
-                    buffer = []
-                    self._write_markdown_entry(buffer, entry, include_git, as_list=True)
-                    parts.append(''.join(buffer))
-                parts.append("\n")
+                    yield self._format_markdown_entry(entry, include_git)
+                yield "\n"
         elif group_by == "date":
             grouped = self._group_by_date(entries)
             for date, date_entries in grouped.items():
-                parts.append(f"## {date}\n\n")
+                yield f"## {date}\n\n"
                 for entry in date_entries:
-                    buffer = []
-                    self._write_markdown_entry(buffer, entry, include_git, as_list=True)
-                    parts.append(''.join(buffer))
-                parts.append("\n")
+                    yield self._format_markdown_entry(entry, include_git)
+                yield "\n"
         elif group_by == "tags":
             grouped = self._group_by_tags(entries)
             for tag, tag_entries in grouped.items():
-                parts.append(f"## #{tag}\n\n")
+                yield f"## #{tag}\n\n"
                 for entry in tag_entries:
-                    buffer = []
-                    self._write_markdown_entry(buffer, entry, include_git, as_list=True)
-                    parts.append(''.join(buffer))
-                parts.append("\n")
+                    yield self._format_markdown_entry(entry, include_git)
+                yield "\n"
         else:
             for entry in entries:
-                buffer = []
-                self._write_markdown_entry(buffer, entry, include_git, as_list=True)
-                parts.append(''.join(buffer))
-                parts.append("\n")
-        return ''.join(parts)
+                yield self._format_markdown_entry(entry, include_git)
+                yield "\n"
 
-    def _build_text_content(self, entries: List[Entry], include_git: bool, group_by: str) -> str:
-        parts: List[str] = []
-        parts.append("MEMORIA DEL PROYECTO - EXPORTACIÓN PARA LLM\n")
-        parts.append("=" * 60 + "\n\n")
-        parts.append(f"Generado: {datetime.now().isoformat()}\n")
-        parts.append(f"Total de entradas: {len(entries)}\n")
-        parts.append(f"Proyecto: {self.project_root.name}\n\n")
+    def _build_markdown_content(self, entries: List[Entry], include_git: bool, group_by: str,
+                                generated_at: Optional[str] = None) -> str:
+        return ''.join(self._iter_markdown_content(entries, include_git, group_by, generated_at))
+
+    def _iter_text_content(self, entries: List[Entry], include_git: bool, group_by: str,
+                           generated_at: Optional[str] = None) -> Iterator[str]:
+        """Generar el contenido de texto por fragmentos (encabezados y entradas)."""
+        yield "MEMORIA DEL PROYECTO - EXPORTACIÓN PARA LLM\n"
+        yield _TEXT_SEPARATOR
+        yield f"Generado: {generated_at or datetime.now().isoformat()}\n"
+        yield f"Total de entradas: {len(entries)}\n"
+        yield f"Proyecto: {self.project_root.name}\n\n"
 
         if group_by == "type":
             grouped = self._group_by_type(entries)
             for entry_type, type_entries in grouped.items():
-                parts.append(f"{entry_type.upper()}\n")
-                parts.append("-" * len(entry_type) + "\n\n")
+                yield f"{entry_type.upper()}\n"
+                yield _underline(len(entry_type))
                 for entry in type_entries:
-                    buffer: List[str] = []
-                    self._write_text_entry(buffer, entry, include_git, as_list=True)
-                    parts.append(''.join(buffer))
-                parts.append("\n")
+                    yield self._format_text_entry(entry, include_git)
+                yield "\n"
         elif group_by == "date":
             grouped = self._group_by_date(entries)
             for date, date_entries in grouped.items():
-                parts.append(f"{date}\n")
-                parts.append("-" * len(date) + "\n\n")
+                yield f"{date}\n"
+                yield _underline(len(date))
                 for entry in date_entries:
-                    buffer = []
-                    self._write_text_entry(buffer, entry, include_git, as_list=True)
-                    parts.append(''.join(buffer))
-                parts.append("\n")
+                    yield self._format_text_entry(entry, include_git)
+                yield "\n"
         elif group_by == "tags":
             grouped = self._group_by_tags(entries)
             for tag, tag_entries in grouped.items():
-                parts.append(f"#{tag}\n")
-                parts.append("-" * (len(tag) + 1) + "\n\n")
+                yield f"#{tag}\n"
+                yield _underline(len(tag) + 1)
                 for entry in tag_entries:
-                    buffer = []
-                    self._write_text_entry(buffer, entry, include_git, as_list=True)
-                    parts.append(''.join(buffer))
-                parts.append("\n")
+                    yield self._format_text_entry(entry, include_git)
+                yield "\n"
         else:
             for entry in entries:
-                buffer = []
-                self._write_text_entry(buffer, entry, include_git, as_list=True)
-                parts.append(''.join(buffer))
-                parts.append("\n")
-        return ''.join(parts)
+                yield self._format_text_entry(entry, include_git)
+                yield "\n"
+
+    def _build_text_content(self, entries: List[Entry], include_git: bool, group_by: str,
+                            generated_at: Optional[str] = None) -> str:
+        return ''.join(self._iter_text_content(entries, include_git, group_by, generated_at))
 
     def _write_chunked(self, filename_base: str, content: str, ext: str, max_chars: int) -> str:
         """Escribir contenido en múltiples archivos respetando un máximo de caracteres.
@@ -256,127 +414,129 @@ class LLMExporter:
         """
         if max_chars <= 0 or len(content) <= max_chars:
             output_file = self.export_dir / f"{filename_base}.{ext}"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_text_file(output_file, content)
             return str(output_file)
 
-        parts: List[str] = []
+        # Posiciones (inicio y fin) de los separadores, en una sola pasada
+        starts: List[int] = []
+        ends: List[int] = []
+        for match in _CHUNK_SEPARATOR_RE.finditer(content):
+            starts.append(match.start())
+            ends.append(match.end(1))
+
+        # Cada parte se escribe en cuanto se conoce su corte, sin reunir
+        # copias de todo el contenido en una lista
+        first_path = None
+        part_number = 0
         start = 0
         content_len = len(content)
         while start < content_len:
             end = min(start + max_chars, content_len)
-            # Buscar separador hacia atrás para no cortar en medio de una entrada
-            slice_chunk = content[start:end]
-            sep_idx = max(
-                slice_chunk.rfind("\n### "),
-                slice_chunk.rfind("\nENTRADA:"),
-                slice_chunk.rfind("\n---\n"),
-            )
-            if sep_idx <= 0 or end == content_len:
-                cut = end
-            else:
-                cut = start + sep_idx
-            parts.append(content[start:cut])
-            start = cut
-        # Escribir archivos
-        first_path = None
-        for i, part in enumerate(parts, start=1):
-            output_file = self.export_dir / f"{filename_base}_part{i}.{ext}"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(part)
+            # Último separador completo dentro de (start, end) para no cortar
+            # en medio de una entrada
+            cut = end
+            if end < content_len:
+                k = bisect_right(starts, end - _MIN_SEPARATOR_LENGTH) - 1
+                while k >= 0 and ends[k] > end:
+                    k -= 1
+                if k >= 0 and starts[k] > start:
+                    cut = starts[k]
+            part_number += 1
+            output_file = self.export_dir / f"{filename_base}_part{part_number}.{ext}"
+            self._write_text_file(output_file, content[start:cut])
             if first_path is None:
                 first_path = str(output_file)
+            start = cut
         return first_path if first_path else str(self.export_dir / f"{filename_base}.{ext}")
     
-    def _write_markdown_entry(self, file_or_list, entry: Entry, include_git: bool, as_list: bool = False):
-        """Escribir entrada en formato Markdown."""
-        writer = (lambda s: file_or_list.append(s)) if as_list else (lambda s: file_or_list.write(s))
-        writer(f"### {entry.title}\n\n")
-        writer(f"**Tipo:** {entry.entry_type}\n")
-        writer(f"**ID:** {entry.entry_id}\n")
-        writer(f"**Fecha:** {entry.timestamp}\n")
-        if entry.tags:
-            writer(f"**Etiquetas:** {', '.join(entry.tags)}\n")
-        if entry.files_affected:
-            writer(f"**Archivos:** {', '.join(entry.files_affected)}\n")
-        if include_git and entry.git_info:
-            git_info = entry.git_info
-            writer(f"**Git:** {git_info.get('current_commit', 'N/A')} ")
-            writer(f"({git_info.get('branch', 'N/A')})")
-            if not git_info.get('is_clean'):
-                writer(" ⚠️ Cambios pendientes")
-            writer("\n")
-        writer("\n")
-        writer(f"{entry.content}\n\n")
-        if entry.llm_context:
-            writer("> **Contexto LLM:** " + entry.llm_context + "\n\n")
-        writer("---\n\n")
+    @staticmethod
+    def _format_git(git_info: Dict[str, Any], label: str, dirty_mark: str) -> str:
+        """Formatear la línea de Git de una entrada."""
+        line = f"{label} {git_info.get('current_commit', 'N/A')} ({git_info.get('branch', 'N/A')})"
+        if not git_info.get('is_clean'):
+            line += dirty_mark
+        return line + "\n"
     
-    def _write_text_entry(self, file_or_list, entry: Entry, include_git: bool, as_list: bool = False):
-        """Escribir entrada en formato texto plano."""
-        writer = (lambda s: file_or_list.append(s)) if as_list else (lambda s: file_or_list.write(s))
-        writer(f"ENTRADA: {entry.title}\n")
-        writer("-" * (len(entry.title) + 9) + "\n\n")
-        writer(f"Tipo: {entry.entry_type}\n")
-        writer(f"ID: {entry.entry_id}\n")
-        writer(f"Fecha: {entry.timestamp}\n")
-        if entry.tags:
-            writer(f"Etiquetas: {', '.join(entry.tags)}\n")
-        if entry.files_affected:
-            writer(f"Archivos: {', '.join(entry.files_affected)}\n")
-        if include_git and entry.git_info:
-            git_info = entry.git_info
-            writer(f"Git: {git_info.get('current_commit', 'N/A')} ")
-            writer(f"({git_info.get('branch', 'N/A')})")
-            if not git_info.get('is_clean'):
-                writer(" [CAMBIOS PENDIENTES]")
-            writer("\n")
-        writer("\n")
-        writer(f"CONTENIDO:\n{entry.content}\n\n")
-        if entry.llm_context:
-            writer(f"CONTEXTO LLM: {entry.llm_context}\n\n")
-        writer("=" * 60 + "\n\n")
+    def _format_markdown_entry(self, entry: Entry, include_git: bool) -> str:
+        """Formatear una entrada en Markdown como un único string."""
+        tags, files, git_info, llm_context = entry.tags, entry.files_affected, entry.git_info, entry.llm_context
+        tags_line = f"**Etiquetas:** {', '.join(tags)}\n" if tags else ""
+        files_line = f"**Archivos:** {', '.join(files)}\n" if files else ""
+        git_line = (self._format_git(git_info, "**Git:**", " ⚠️ Cambios pendientes")
+                    if include_git and git_info else "")
+        context_line = f"> **Contexto LLM:** {llm_context}\n\n" if llm_context else ""
+        return (
+            f"### {entry.title}\n\n"
+            f"**Tipo:** {entry.entry_type}\n"
+            f"**ID:** {entry.entry_id}\n"
+            f"**Fecha:** {entry.timestamp}\n"
+            f"{tags_line}{files_line}{git_line}"
+            f"\n{entry.content}\n\n"
+            f"{context_line}---\n\n"
+        )
+    
+    def _format_text_entry(self, entry: Entry, include_git: bool) -> str:
+        """Formatear una entrada en texto plano como un único string."""
+        tags, files, git_info, llm_context = entry.tags, entry.files_affected, entry.git_info, entry.llm_context
+        tags_line = f"Etiquetas: {', '.join(tags)}\n" if tags else ""
+        files_line = f"Archivos: {', '.join(files)}\n" if files else ""
+        git_line = (self._format_git(git_info, "Git:", " [CAMBIOS PENDIENTES]")
+                    if include_git and git_info else "")
+        context_line = f"CONTEXTO LLM: {llm_context}\n\n" if llm_context else ""
+        return (
+            f"ENTRADA: {entry.title}\n"
+            f"{_underline(len(entry.title) + 9)}"
+            f"Tipo: {entry.entry_type}\n"
+            f"ID: {entry.entry_id}\n"
+            f"Fecha: {entry.timestamp}\n"
+            f"{tags_line}{files_line}{git_line}"
+            f"\nCONTENIDO:\n{entry.content}\n\n"
+            f"{context_line}{_TEXT_SEPARATOR}"
+        )
     
     def _group_by_type(self, entries: List[Entry]) -> Dict[str, List[Entry]]:
         """Agrupar entradas por tipo."""
-        grouped = {}
+        grouped: Dict[str, List[Entry]] = defaultdict(list)
         for entry in entries:
-            entry_type = entry.entry_type
-            if entry_type not in grouped:
-                grouped[entry_type] = []
-            grouped[entry_type].append(entry)
+            grouped[entry.entry_type].append(entry)
         
         # Ordenar por tipo
-        return dict(sorted(grouped.items()))
+        return {key: grouped[key] for key in sorted(grouped)}
+    
+    @staticmethod
+    def _date_key(timestamp: str) -> str:
+        """Obtener la fecha (YYYY-MM-DD) de un timestamp ISO."""
+        # Formato habitual: la fecha son los primeros 10 caracteres
+        if len(timestamp) >= 10 and timestamp[4] == '-' and timestamp[7] == '-':
+            return timestamp[:10]
+        try:
+            return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d")
+        except ValueError:
+            return timestamp[:10] if timestamp else "unknown"
     
     def _group_by_date(self, entries: List[Entry]) -> Dict[str, List[Entry]]:
         """Agrupar entradas por fecha."""
-        grouped = {}
+        grouped: Dict[str, List[Entry]] = defaultdict(list)
         for entry in entries:
-            try:
-                dt = datetime.fromisoformat(entry.timestamp)
-                date = dt.strftime("%Y-%m-%d")
-            except ValueError:
-                date = entry.timestamp[:10] if entry.timestamp else "unknown"
-            
-            if date not in grouped:
-                grouped[date] = []
-            grouped[date].append(entry)
+            timestamp = entry.timestamp
+            # Caso habitual resuelto en línea; el resto pasa por `_date_key`
+            if len(timestamp) >= 10 and timestamp[4] == '-' and timestamp[7] == '-':
+                grouped[timestamp[:10]].append(entry)
+            else:
+                grouped[self._date_key(timestamp)].append(entry)
         
         # Ordenar por fecha (más reciente primero)
-        return dict(sorted(grouped.items(), reverse=True))
+        return {key: grouped[key] for key in sorted(grouped, reverse=True)}
     
     def _group_by_tags(self, entries: List[Entry]) -> Dict[str, List[Entry]]:
         """Agrupar entradas por etiquetas."""
-        grouped = {}
+        grouped: Dict[str, List[Entry]] = defaultdict(list)
         for entry in entries:
             for tag in entry.tags:
-                if tag not in grouped:
-                    grouped[tag] = []
                 grouped[tag].append(entry)
         
         # Ordenar por etiqueta
-        return dict(sorted(grouped.items()))
+        return {key: grouped[key] for key in sorted(grouped)}
     
     def export_summary(self, output_format: str = "markdown") -> str:
         """
@@ -391,90 +551,103 @@ class LLMExporter:
         memory_system = MemorySystem(self.project_root)
         stats = memory_system.get_statistics()
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"memory_summary_{timestamp}"
+        now = datetime.now()
+        generated_at = now.isoformat()
+        filename = f"memory_summary_{now.strftime('%Y%m%d_%H%M%S')}"
+        
+        if output_format == "json":
+            return self._export_summary_json(stats, filename, generated_at)
         
+        # Distribución por tipo y etiquetas ordenadas, comunes a markdown y texto
+        total = stats.get('total_entries', 0) or 1
+        type_rows = [
+            (entry_type, count, count * 100.0 / total)
+            for entry_type, count in sorted(stats.get('by_type', {}).items())
+        ]
+        sorted_tags = sorted(stats.get('total_tags', []))
         if output_format == "markdown":
-            return self._export_summary_markdown(stats, filename)
-        elif output_format == "json":
-            return self._export_summary_json(stats, filename)
+            return self._export_summary_markdown(stats, filename, generated_at, type_rows, sorted_tags)
         else:
-            return self._export_summary_text(stats, filename)
+            return self._export_summary_text(stats, filename, generated_at, type_rows, sorted_tags)
     
-    def _export_summary_markdown(self, stats: Dict[str, Any], filename: str) -> str:
+    def _export_summary_markdown(self, stats: Dict[str, Any], filename: str,
+                                 generated_at: Optional[str],
+                                 type_rows: List[Tuple[str, int, float]],
+                                 sorted_tags: List[str]) -> str:
         """Exportar resumen en formato Markdown."""
         output_file = self.export_dir / f"{filename}.md"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("# Resumen Ejecutivo - Sistema de Memoria\n\n")
-            f.write(f"**Generado:** {datetime.now().isoformat()}\n")
-            f.write(f"**Proyecto:** {self.project_root.name}\n\n")
-            
-            f.write(f"## Estadísticas Generales\n\n")
-            f.write(f"- **Total de entradas:** {stats.get('total_entries', 0)}\n")
-            f.write(f"- **Fecha de creación:** {stats.get('created', 'N/A')}\n")
-            f.write(f"- **Última actualización:** {stats.get('last_updated', 'N/A')}\n\n")
-            
-            f.write(f"## Distribución por Tipo\n\n")
-            by_type = stats.get('by_type', {})
-            for entry_type, count in sorted(by_type.items()):
-                percentage = (count / stats.get('total_entries', 1)) * 100
-                f.write(f"- **{entry_type}:** {count} ({percentage:.1f}%)\n")
-            
-            f.write(f"\n## Etiquetas Únicas\n\n")
-            total_tags = stats.get('total_tags', [])
-            f.write(f"- **Total:** {len(total_tags)}\n")
-            if total_tags:
-                f.write(f"- **Lista:** {', '.join(sorted(total_tags))}\n")
+        parts: List[str] = []
+        parts.append("# Resumen Ejecutivo - Sistema de Memoria\n\n")
+        parts.append(f"**Generado:** {generated_at or datetime.now().isoformat()}\n")
+        parts.append(f"**Proyecto:** {self.project_root.name}\n\n")
+        
+        parts.append(f"## Estadísticas Generales\n\n")
+        parts.append(f"- **Total de entradas:** {stats.get('total_entries', 0)}\n")
+        parts.append(f"- **Fecha de creación:** {stats.get('created', 'N/A')}\n")
+        parts.append(f"- **Última actualización:** {stats.get('last_updated', 'N/A')}\n\n")
+        
+        parts.append(f"## Distribución por Tipo\n\n")
+        for entry_type, count, percentage in type_rows:
+            parts.append(f"- **{entry_type}:** {count} ({percentage:.1f}%)\n")
+        
+        parts.append(f"\n## Etiquetas Únicas\n\n")
+        parts.append(f"- **Total:** {len(sorted_tags)}\n")
+        if sorted_tags:
+            parts.append(f"- **Lista:** {', '.join(sorted_tags)}\n")
+        
+        self._write_text_file(output_file, ''.join(parts))
         
         return str(output_file)
     
-    def _export_summary_json(self, stats: Dict[str, Any], filename: str) -> str:
+    def _export_summary_json(self, stats: Dict[str, Any], filename: str,
+                             generated_at: Optional[str] = None) -> str:
         """Exportar resumen en formato JSON."""
         output_file = self.export_dir / f"{filename}.json"
         
         export_data = {
             "metadata": {
-                "exported_at": datetime.now().isoformat(),
+                "exported_at": generated_at or datetime.now().isoformat(),
                 "project": self.project_root.name,
                 "format": "summary_json"
             },
             "statistics": stats
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        output_file.write_bytes(dumps_bytes(export_data))
         
         return str(output_file)
     
-    def _export_summary_text(self, stats: Dict[str, Any], filename: str) -> str:
+    def _export_summary_text(self, stats: Dict[str, Any], filename: str,
+                             generated_at: Optional[str],
+                             type_rows: List[Tuple[str, int, float]],
+                             sorted_tags: List[str]) -> str:
         """Exportar resumen en formato texto."""
         output_file = self.export_dir / f"{filename}.txt"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("RESUMEN EJECUTIVO - SISTEMA DE MEMORIA\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"Generado: {datetime.now().isoformat()}\n")
-            f.write(f"Proyecto: {self.project_root.name}\n\n")
-            
-            f.write(f"ESTADÍSTICAS GENERALES\n")
-            f.write("-" * 25 + "\n")
-            f.write(f"Total de entradas: {stats.get('total_entries', 0)}\n")
-            f.write(f"Fecha de creación: {stats.get('created', 'N/A')}\n")
-            f.write(f"Última actualización: {stats.get('last_updated', 'N/A')}\n\n")
-            
-            f.write(f"DISTRIBUCIÓN POR TIPO\n")
-            f.write("-" * 22 + "\n")
-            by_type = stats.get('by_type', {})
-            for entry_type, count in sorted(by_type.items()):
-                percentage = (count / stats.get('total_entries', 1)) * 100
-                f.write(f"{entry_type}: {count} ({percentage:.1f}%)\n")
-            
-            f.write(f"\nETIQUETAS ÚNICAS\n")
-            f.write("-" * 15 + "\n")
-            total_tags = stats.get('total_tags', [])
-            f.write(f"Total: {len(total_tags)}\n")
-            if total_tags:
-                f.write(f"Lista: {', '.join(sorted(total_tags))}\n")
+        parts: List[str] = []
+        parts.append("RESUMEN EJECUTIVO - SISTEMA DE MEMORIA\n")
+        parts.append("=" * 50 + "\n\n")
+        parts.append(f"Generado: {generated_at or datetime.now().isoformat()}\n")
+        parts.append(f"Proyecto: {self.project_root.name}\n\n")
+        
+        parts.append(f"ESTADÍSTICAS GENERALES\n")
+        parts.append("-" * 25 + "\n")
+        parts.append(f"Total de entradas: {stats.get('total_entries', 0)}\n")
+        parts.append(f"Fecha de creación: {stats.get('created', 'N/A')}\n")
+        parts.append(f"Última actualización: {stats.get('last_updated', 'N/A')}\n\n")
+        
+        parts.append(f"DISTRIBUCIÓN POR TIPO\n")
+        parts.append("-" * 22 + "\n")
+        for entry_type, count, percentage in type_rows:
+            parts.append(f"{entry_type}: {count} ({percentage:.1f}%)\n")
+        
+        parts.append(f"\nETIQUETAS ÚNICAS\n")
+        parts.append("-" * 15 + "\n")
+        parts.append(f"Total: {len(sorted_tags)}\n")
+        if sorted_tags:
+            parts.append(f"Lista: {', '.join(sorted_tags)}\n")
+        
+        self._write_text_file(output_file, ''.join(parts))
         
         return str(output_file)
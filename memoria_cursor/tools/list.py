@@ -2,7 +2,9 @@
 Herramienta para listar y buscar entradas en el sistema de memoria.
 """
 
-from typing import List, Optional
+import sys
+from itertools import islice
+from typing import Iterator, List, Optional
 from rich.console import Console
 from rich.panel import Panel
 from datetime import datetime
@@ -20,7 +22,8 @@ def list_entries(project_root: str = ".",
                 date_from: Optional[str] = None,
                 date_to: Optional[str] = None,
                 show_git: bool = False,
-                stats: bool = False) -> List[Entry]:
+                stats: bool = False,
+                after: Optional[str] = None) -> List[Entry]:
     """
     Listar entradas del sistema de memoria con filtros opcionales.
     
@@ -35,6 +38,7 @@ def list_entries(project_root: str = ".",
         date_to: Fecha de fin (YYYY-MM-DD)
         show_git: Mostrar información de Git
         stats: Mostrar estadísticas en lugar de entradas
+        after: ID de la última entrada mostrada (paginación por cursor)
         
     Returns:
         Lista de entradas filtradas
@@ -53,7 +57,8 @@ def list_entries(project_root: str = ".",
         tags=tags,
         search=search,
         date_from=date_from,
-        date_to=date_to
+        date_to=date_to,
+        after=after
     )
     
     return entries
@@ -62,7 +67,8 @@ def list_entries(project_root: str = ".",
 def display_entries(entries: List[Entry], 
                    show_git: bool = False,
                    limit: Optional[int] = None,
-                   offset: int = 0) -> None:
+                   offset: int = 0,
+                   has_more: bool = False) -> None:
     """
     Mostrar entradas en formato de lista usando print para evitar problemas de consola.
     
@@ -71,86 +77,92 @@ def display_entries(entries: List[Entry],
         show_git: Mostrar información de Git
         limit: Número máximo de entradas a mostrar
         offset: Número de entradas omitidas desde el inicio
+        has_more: Hay más entradas después de las mostradas (se indica el
+            cursor de la página siguiente)
     """
     if not entries:
         console = Console()
         console.print(Panel("No se encontraron entradas", style="yellow"))
         return
     
-    # Aplicar límite si se especifica
-    if limit:
+    # Aplicar límite solo si la lista no viene ya acotada por `list_entries`
+    if limit and len(entries) > limit:
         entries = entries[-limit:]
     
-    # Mostrar título
-    print("\n📚 Entradas de Memoria")
-    print("=" * 50)
+    # Construir toda la salida y escribirla de una vez
+    lines = ["", "📚 Entradas de Memoria", "=" * 50]
     
     # Mostrar información de paginación si hay offset
     if offset > 0:
-        print(f"📍 Mostrando desde la entrada #{offset + 1}")
+        lines.append(f"📍 Mostrando desde la entrada #{offset + 1}")
     if limit:
-        print(f"📄 Mostrando máximo {limit} entradas")
+        lines.append(f"📄 Mostrando máximo {limit} entradas")
     if offset > 0 or limit:
-        print()
+        lines.append("")
     
     # Mostrar cada entrada en formato de lista
     for i, entry in enumerate(entries):
         # Separador entre entradas
         if i > 0:
-            print("\n" + "─" * 50)
-        
-        # ID completo
-        print(f"ID: {entry.entry_id}")
-        
-        # Tipo
-        print(f"Tipo: {entry.entry_type.upper()}")
+            lines.append("\n" + "─" * 50)
         
-        # Título completo
-        print(f"Título: {entry.title}")
-        
-        # Fecha
-        try:
-            dt = datetime.fromisoformat(entry.timestamp)
-            formatted_date = dt.strftime("%Y-%m-%d %H:%M")
-        except ValueError:
-            formatted_date = entry.timestamp[:16] if entry.timestamp else "N/A"
-        print(f"Fecha: {formatted_date}")
-        
-        # Etiquetas
-        if entry.tags:
-            tags_str = ", ".join(entry.tags)
-            print(f"Etiquetas: {tags_str}")
-        else:
-            print("Etiquetas: Ninguna")
+        # ID completo, tipo, título completo, fecha y etiquetas en un solo string
+        tags = entry.tags
+        lines.append(
+            f"ID: {entry.entry_id}\n"
+            f"Tipo: {entry.entry_type.upper()}\n"
+            f"Título: {entry.title}\n"
+            f"Fecha: {_format_timestamp(entry.timestamp)}\n"
+            f"Etiquetas: {', '.join(tags) if tags else 'Ninguna'}"
+        )
         
         # Archivos afectados
-        if entry.files_affected:
-            files_str = ", ".join(entry.files_affected)
-            print(f"Archivos: {files_str}")
+        files_affected = entry.files_affected
+        if files_affected:
+            lines.append(f"Archivos: {', '.join(files_affected)}")
         
         # Entradas relacionadas
-        if entry.related_entries:
-            related_str = ", ".join(entry.related_entries)
-            print(f"Relacionadas: {related_str}")
+        related_entries = entry.related_entries
+        if related_entries:
+            lines.append(f"Relacionadas: {', '.join(related_entries)}")
         
         # Contenido truncado para vista previa
-        if entry.content:
+        content = entry.content
+        if content:
             # Truncar contenido a ~120 caracteres para mantener formato limpio
-            content_preview = entry.content.strip()
+            content_preview = content.strip()
             if len(content_preview) > 120:
                 content_preview = content_preview[:117] + "..."
-            print(f"Contenido: {content_preview}")
+            lines.append(f"Contenido: {content_preview}")
         
         # Información de Git si se solicita
-        if show_git and entry.git_info:
-            git_info = entry.git_info
-            print(f"Git Commit: {git_info.get('current_commit', 'N/A')}")
-            print(f"Git Rama: {git_info.get('branch', 'N/A')}")
-            if git_info.get('commit_message'):
-                print(f"Git Mensaje: {git_info.get('commit_message', 'N/A')}")
+        git_info = entry.git_info if show_git else None
+        if git_info:
+            lines.append(f"Git Commit: {git_info.get('current_commit', 'N/A')}")
+            lines.append(f"Git Rama: {git_info.get('branch', 'N/A')}")
+            commit_message = git_info.get('commit_message')
+            if commit_message:
+                lines.append(f"Git Mensaje: {commit_message}")
     
     # Mostrar resumen
-    print(f"\n📊 Total de entradas mostradas: {len(entries)}")
+    lines.append(f"\n📊 Total de entradas mostradas: {len(entries)}")
+    if has_more:
+        lines.append(f"➡️  Página siguiente: --after {entries[-1].entry_id}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _format_timestamp(timestamp: str) -> str:
+    """Formatear un timestamp ISO como `YYYY-MM-DD HH:MM`."""
+    # Formato habitual: basta con recortar el string, sin parsearlo
+    if (len(timestamp) >= 16 and timestamp[4] == '-' and timestamp[7] == '-'
+            and timestamp[10] in 'T ' and timestamp[13] == ':'):
+        return f"{timestamp[:10]} {timestamp[11:16]}"
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M")
+    except ValueError:
+        return timestamp[:16] if timestamp else "N/A"
 
 
 def display_entry_details(entry: Entry, show_git: bool = False) -> None:
@@ -206,57 +218,103 @@ def _get_statistics(memory_system: MemorySystem) -> List[Entry]:
     """
     stats = memory_system.get_statistics()
     
-    console = Console()
-    
-    # Mostrar título
-    console.print("\n📊 Estadísticas del Sistema de Memoria", style="bold magenta")
-    console.print("=" * 50)
+    # Construir todo el reporte y mostrarlo con una sola llamada a la consola
+    lines = [
+        "",
+        "[bold magenta]📊 Estadísticas del Sistema de Memoria[/bold magenta]",
+        "=" * 50,
+    ]
     
     # Estadísticas básicas
-    console.print(f"Total de entradas: {stats.get('total_entries', 0)}", style="bold")
+    lines.append(f"[bold]Total de entradas: {stats.get('total_entries', 0)}[/bold]")
     created = stats.get("created", "N/A")
     if created != "N/A":
         created = created[:10]
-    console.print(f"Fecha de creación: {created}")
+    lines.append(f"Fecha de creación: {created}")
     
     last_updated = stats.get("last_updated", "N/A")
     if last_updated != "N/A":
         last_updated = last_updated[:10]
-    console.print(f"Última actualización: {last_updated}")
+    lines.append(f"Última actualización: {last_updated}")
     
     # Estadísticas por tipo
     by_type = stats.get("by_type", {})
+    sorted_types = sorted(by_type.items())
     if by_type:
-        console.print("\n[bold]Distribución por tipo:[/bold]")
-        for entry_type, count in sorted(by_type.items()):
-            console.print(f"  {entry_type}: {count}")
+        lines.append("\n[bold]Distribución por tipo:[/bold]")
+        for entry_type, count in sorted_types:
+            lines.append(f"  {entry_type}: {count}")
     
     # Total de etiquetas únicas
     total_tags = stats.get("total_tags", [])
-    console.print(f"\nEtiquetas únicas: {len(total_tags)}")
+    lines.append(f"\nEtiquetas únicas: {len(total_tags)}")
     
     if total_tags:
-        console.print("[bold]Lista de etiquetas:[/bold]")
+        lines.append("[bold]Lista de etiquetas:[/bold]")
         # Agrupar etiquetas por líneas
         tags_per_line = 5
         for i in range(0, len(total_tags), tags_per_line):
             line_tags = total_tags[i:i + tags_per_line]
-            console.print(f"  {', '.join(line_tags)}")
+            lines.append(f"  {', '.join(line_tags)}")
     
     # Mostrar gráfico de barras simple para tipos
     if by_type:
-        console.print("\n[bold]Distribución por tipo:[/bold]")
-        max_count = max(by_type.values()) if by_type.values() else 1
+        lines.append("\n[bold]Distribución por tipo:[/bold]")
+        max_count = max(by_type.values())
+        total = stats.get("total_entries", 1) or 1
         
-        for entry_type, count in sorted(by_type.items()):
+        for entry_type, count in sorted_types:
             bar_length = int((count / max_count) * 30)
             bar = "█" * bar_length
-            percentage = (count / stats.get("total_entries", 1)) * 100
-            console.print(f"{entry_type:12} {bar} {count:3} ({percentage:5.1f}%)")
+            percentage = (count / total) * 100
+            lines.append(f"{entry_type:12} {bar} {count:3} ({percentage:5.1f}%)")
+    
+    Console().print("\n".join(lines))
     
     return []  # Retornar lista vacía para compatibilidad
 
 
+# Entradas mostradas por página en la búsqueda interactiva
+INTERACTIVE_PAGE_SIZE = 20
+
+# Menú de la búsqueda interactiva, construido una sola vez
+_SEARCH_MENU = "\n".join((
+    "\nOpciones de búsqueda:",
+    "1. Buscar por texto",
+    "2. Filtrar por tipo",
+    "3. Filtrar por etiquetas",
+    "4. Filtrar por fecha",
+    "5. Ver estadísticas",
+    "6. Salir",
+))
+
+
+def _display_in_pages(entries: Iterator[Entry],
+                      page_size: int = INTERACTIVE_PAGE_SIZE) -> None:
+    """
+    Mostrar entradas por páginas, pidiendo confirmación entre páginas.
+    
+    Las entradas se consumen del iterador a medida que se muestran, de modo
+    que la primera página aparece sin recorrer todos los resultados.
+    
+    Args:
+        entries: Iterador de entradas (por ejemplo, de `iter_entries`)
+        page_size: Número de entradas por página
+    """
+    page = list(islice(entries, page_size))
+    while True:
+        # Mirar una entrada más para saber si quedan páginas
+        following = next(entries, None)
+        display_entries(page)
+        if following is None:
+            return
+        answer = input("\n-- Enter para ver más, 'q' para volver al menú -- ").strip().lower()
+        if answer == "q":
+            return
+        page = [following]
+        page.extend(islice(entries, page_size - 1))
+
+
 def search_entries_interactive(project_root: str = ".") -> None:
     """
     Búsqueda interactiva de entradas.
@@ -272,42 +330,32 @@ def search_entries_interactive(project_root: str = ".") -> None:
     memory_system = MemorySystem(project_root)
     
     while True:
-        console.print("\nOpciones de búsqueda:")
-        console.print("1. Buscar por texto")
-        console.print("2. Filtrar por tipo")
-        console.print("3. Filtrar por etiquetas")
-        console.print("4. Filtrar por fecha")
-        console.print("5. Ver estadísticas")
-        console.print("6. Salir")
+        console.print(_SEARCH_MENU)
         
         choice = input("\nSelecciona una opción (1-6): ").strip()
         
         if choice == "1":
             search_term = input("Término de búsqueda: ").strip()
             if search_term:
-                entries = memory_system.list_entries(search=search_term)
-                display_entries(entries)
+                _display_in_pages(memory_system.iter_entries(search=search_term))
         
         elif choice == "2":
             console.print("\nTipos disponibles: decision, change, context, bug, feature, note")
             entry_type = input("Tipo de entrada: ").strip().lower()
             if entry_type:
-                entries = memory_system.list_entries(entry_type=entry_type)
-                display_entries(entries)
+                _display_in_pages(memory_system.iter_entries(entry_type=entry_type))
         
         elif choice == "3":
             tags_input = input("Etiquetas (separadas por comas): ").strip()
             if tags_input:
                 tags = [tag.strip() for tag in tags_input.split(",")]
-                entries = memory_system.list_entries(tags=tags)
-                display_entries(entries)
+                _display_in_pages(memory_system.iter_entries(tags=tags))
         
         elif choice == "4":
             date_from = input("Fecha desde (YYYY-MM-DD): ").strip()
             date_to = input("Fecha hasta (YYYY-MM-DD): ").strip()
             if date_from or date_to:
-                entries = memory_system.list_entries(date_from=date_from, date_to=date_to)
-                display_entries(entries)
+                _display_in_pages(memory_system.iter_entries(date_from=date_from, date_to=date_to))
         
         elif choice == "5":
             _get_statistics(memory_system)
@@ -34,6 +34,16 @@ setup(
             "sphinx>=4.0.0",
             "sphinx-rtd-theme>=1.0.0",
         ],
+        "git": [
+            "pygit2>=1.0.0",     # Consultas Git en proceso (opcional)
+        ],
+        "fast": [
+            "orjson>=3.0.0",     # Serialización JSON acelerada (opcional)
+            "fastjsonschema>=2.19.0",  # Validación con esquema compilado (opcional)
+        ],
+        "tokens": [
+            "tiktoken>=0.4.0",   # Conteo real de tokens al dividir exportaciones (opcional)
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -40,3 +40,21 @@ def test_cli_export_chunked(tmp_path: Path):
 		"export", "--chunked", "--max-chars", "1500"
 	])
 	assert result.exit_code == 0
+
+
+def test_cli_list_next_page_hint_only_when_more_entries(tmp_path: Path):
+	project_root = tmp_path
+	ms = MemorySystem(str(project_root), auto_git=False)
+	for i in range(4):
+		ms.create_entry("note", f"E{i}", "Contenido")
+
+	runner = CliRunner()
+	first = runner.invoke(main, ["-p", str(project_root), "list", "--limit", "2"])
+	assert first.exit_code == 0
+	assert "Total de entradas mostradas: 2" in first.output
+	cursor = first.output.split("--after ")[1].split()[0]
+
+	second = runner.invoke(main, ["-p", str(project_root), "list", "--limit", "2", "--after", cursor])
+	assert second.exit_code == 0
+	assert "E3" in second.output
+	assert "Página siguiente" not in second.output
@@ -2,10 +2,11 @@
 Pruebas para la clase Entry.
 """
 
+import json
 import pytest
 import uuid
-from datetime import datetime
-from memoria_cursor.core.entry import Entry
+from datetime import datetime, timezone
+from memoria_cursor.core.entry import Entry, now_iso
 
 
 class TestEntry:
@@ -77,6 +78,19 @@ class TestEntry:
         assert "id" in entry_dict
         assert "timestamp" in entry_dict
     
+    def test_entry_to_json(self):
+        """Probar serialización JSON como string y como bytes."""
+        entry = Entry(
+            entry_type="note",
+            title="Título con ñ",
+            content="Contenido"
+        )
+
+        as_text = entry.to_json()
+        assert "Título con ñ" in as_text
+        assert entry.to_json_bytes() == as_text.encode("utf-8")
+        assert json.loads(as_text) == entry.to_dict()
+
     def test_entry_from_dict(self):
         """Probar creación desde diccionario."""
         test_uuid = "550e8400-e29b-41d4-a716-446655440000"
@@ -100,6 +114,37 @@ class TestEntry:
         assert entry.content == "Test content"
         assert entry.tags == ["test"]
     
+    def test_entry_from_dict_missing_keys(self):
+        """Probar creación desde diccionario incompleto (valores por defecto)."""
+        entry = Entry.from_dict({"type": "note", "title": "Parcial"})
+        
+        assert entry.content == ""
+        assert entry.tags == []
+        assert entry.files_affected == []
+        assert entry.related_entries == []
+        assert entry.entry_id is not None
+        
+        entry.add_tag("nuevo")
+        assert entry.tags == ["nuevo"]
+    
+    def test_entry_from_dict_null_lists(self):
+        """Probar que listas nulas (entries.json editado a mano) se leen como vacías."""
+        entry = Entry.from_dict({
+            "id": "550e8400-e29b-41d4-a716-446655440000",
+            "timestamp": "2025-01-01T12:00:00",
+            "type": "note",
+            "title": "Nulas",
+            "content": "Contenido",
+            "tags": None,
+            "files_affected": None,
+            "related_entries": None,
+        })
+        
+        assert entry.tags == []
+        assert entry.files_affected == []
+        assert entry.related_entries == []
+        assert entry.matches_search("nulas") is True
+    
     def test_entry_tag_operations(self):
         """Probar operaciones con etiquetas."""
         entry = Entry(
@@ -184,7 +229,40 @@ class TestEntry:
         
         # Búsqueda que no coincide
         assert entry.matches_search("nonexistent") is False
+
+    def test_entry_search_does_not_cross_fields(self):
+        """Probar que un término no coincide uniendo el final de un campo con el siguiente."""
+        entry = Entry(
+            entry_type="note",
+            title="abc",
+            content="def",
+            tags=["ghi"]
+        )
+        
+        assert entry.matches_search("bc") is True
+        assert entry.matches_search("cd") is False
+        assert entry.matches_search("fg") is False
     
+    def test_entry_search_after_mutation(self):
+        """Probar que la búsqueda refleja cambios posteriores en los campos."""
+        entry = Entry(
+            entry_type="note",
+            title="Original",
+            content="Contenido"
+        )
+
+        assert entry.matches_search("nuevo") is False
+
+        entry.title = "Título Nuevo"
+        assert entry.matches_search("nuevo") is True
+
+        entry.add_tag("Backend")
+        assert entry.matches_search("backend") is True
+
+        entry.update_content("Texto actualizado")
+        assert entry.matches_search("actualizado") is True
+        assert entry.matches_search("contenido") is False
+
     def test_entry_string_representation(self):
         """Probar representación string de la entrada."""
         entry = Entry(
@@ -301,3 +379,13 @@ def test_entry_related_entries_empty():
     restored_entry = Entry.from_dict(entry_dict)
     assert restored_entry.related_entries == []
     assert restored_entry.has_related_entries() is False
+
+
+def test_now_iso_matches_datetime_isoformat():
+    """now_iso produce el mismo formato que datetime.now(timezone.utc).isoformat()."""
+    stamp = now_iso()
+    parsed = datetime.fromisoformat(stamp)
+
+    assert parsed.tzinfo == timezone.utc
+    assert parsed.isoformat() == stamp
+    assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
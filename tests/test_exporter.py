@@ -2,8 +2,14 @@
 Pruebas del exportador LLM.
 """
 
+import json
+import os
 from pathlib import Path
+
+import pytest
+
 from memoria_cursor.core.memory_system import MemorySystem
+from memoria_cursor.tools import export as export_module
 from memoria_cursor.tools.export import LLMExporter
 
 
@@ -35,8 +41,10 @@ def test_export_chunking(tmp_path: Path):
 
     # Crear varias entradas para forzar chunking
     long_content = "X" * 1000
-    for i in range(10):
-        ms.create_entry("note", f"Entrada {i}", long_content, tags=["chunk"])
+    ms.create_entries([
+        {"entry_type": "note", "title": f"Entrada {i}", "content": long_content, "tags": ["chunk"]}
+        for i in range(10)
+    ])
 
     exporter = LLMExporter(str(project_root))
     output = exporter.export_for_llm(
@@ -51,3 +59,142 @@ def test_export_chunking(tmp_path: Path):
     # Debe existir al menos la parte 1
     assert first.name.endswith(".md")
 
+
+
+def test_export_text_group_by_date(tmp_path: Path):
+    project_root = tmp_path
+    ms = MemorySystem(str(project_root), auto_git=False)
+    ms.create_entry("note", "Primera", "Contenido 1")
+    ms.create_entry("bug", "Segunda", "Contenido 2", llm_context="Contexto extra")
+
+    exporter = LLMExporter(str(project_root))
+    output = exporter.export_for_llm(output_format="text", group_by="date")
+
+    text = Path(output).read_text(encoding="utf-8")
+    assert text.startswith("MEMORIA DEL PROYECTO - EXPORTACIÓN PARA LLM\n")
+    assert "Total de entradas: 2\n" in text
+    assert "ENTRADA: Primera\n" in text
+    assert "CONTEXTO LLM: Contexto extra\n" in text
+
+
+def test_export_mmap_writer_matches_buffered(tmp_path: Path, monkeypatch):
+    project_root = tmp_path
+    ms = MemorySystem(str(project_root), auto_git=False)
+    for i in range(5):
+        ms.create_entry("note", f"Entrada {i}", "Contenido con ñ " * 50)
+
+    exporter = LLMExporter(str(project_root))
+    entries = ms.list_entries()
+    chunks = list(exporter._iter_markdown_content(entries, True, "type"))
+
+    buffered = project_root / "buffered.md"
+    exporter._write_stream(buffered, chunks, size_hint=0)
+
+    # Forzar la ruta mmap con una estimación menor al tamaño real
+    monkeypatch.setattr(export_module, "MMAP_WRITE_THRESHOLD", 0)
+    mapped = project_root / "mapped.md"
+    exporter._write_stream(mapped, chunks, size_hint=64)
+
+    assert mapped.read_bytes() == buffered.read_bytes()
+
+
+def test_export_mmap_writer_truncates_on_error(tmp_path: Path, monkeypatch):
+    exporter = LLMExporter(str(tmp_path))
+    monkeypatch.setattr(export_module, "MMAP_WRITE_THRESHOLD", 0)
+
+    def failing_chunks():
+        yield "parcial\n"
+        raise RuntimeError("fallo al generar")
+
+    output = tmp_path / "parcial.md"
+    with pytest.raises(RuntimeError):
+        exporter._write_stream(output, failing_chunks(), size_hint=4096)
+
+    # Sin el relleno NUL de la preasignación
+    assert output.read_bytes() == "parcial\n".replace("\n", os.linesep).encode("utf-8")
+
+
+def test_group_by_date_keys(tmp_path: Path):
+    exporter = LLMExporter(str(tmp_path))
+
+    assert exporter._date_key("2025-01-02T03:04:05+00:00") == "2025-01-02"
+    assert exporter._date_key("2025-01-02") == "2025-01-02"
+    assert exporter._date_key("20250102T030405") == "2025-01-02"
+    assert exporter._date_key("sin fecha") == "sin fecha"
+    assert exporter._date_key("") == "unknown"
+
+
+def test_export_json_matches_json_dump(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Primera", "Línea 1\nLínea 2", tags=["a", "b"])
+    ms.create_entry("bug", "Segunda", "Contenido 2", llm_context="Contexto extra")
+
+    exporter = LLMExporter(str(tmp_path))
+    output = Path(exporter.export_for_llm(output_format="json", include_git=False))
+
+    text = output.read_text(encoding="utf-8")
+    data = json.loads(text)
+    assert [entry["title"] for entry in data["entries"]] == ["Primera", "Segunda"]
+    assert all("git_info" not in entry for entry in data["entries"])
+    assert text == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def test_export_same_second_exports_overwrite_output(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Primera", "Contenido 1", tags=["etiqueta"])
+
+    exporter = LLMExporter(str(tmp_path))
+    by_type = exporter.export_for_llm(output_format="markdown", group_by="type")
+    # En el mismo segundo ambas exportaciones comparten nombre de archivo
+    by_tags = exporter.export_for_llm(output_format="markdown", group_by="tags")
+    assert "## #etiqueta" in Path(by_tags).read_text(encoding="utf-8")
+
+    again = exporter.export_for_llm(output_format="markdown", group_by="type")
+    text = Path(again).read_text(encoding="utf-8")
+    assert "## NOTE" in text
+    assert "## #etiqueta" not in text
+    assert by_type.endswith(".md")
+
+
+def test_exporter_creates_export_dir_on_first_export(tmp_path: Path):
+    assert LLMExporter(str(tmp_path / "otro"))._export_dir is None
+
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Primera", "Contenido 1")
+
+    exporter = LLMExporter(str(tmp_path))
+    output = Path(exporter.export_for_llm(output_format="json"))
+    assert output.parent == tmp_path / "export"
+
+    # El nombre del archivo y la cabecera usan la misma hora
+    exported_at = json.loads(output.read_text(encoding="utf-8"))["metadata"]["exported_at"]
+    stamp = exported_at[:19].replace("-", "").replace(":", "").replace("T", "_")
+    assert output.name == f"memory_export_{stamp}.json"
+
+
+def test_export_summary_json(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Primera", "Contenido", tags=["b", "a"])
+
+    output = Path(LLMExporter(str(tmp_path)).export_summary("json"))
+
+    text = output.read_text(encoding="utf-8")
+    data = json.loads(text)
+    assert data["metadata"]["format"] == "summary_json"
+    assert data["statistics"]["total_entries"] == 1
+    assert text == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def test_chunk_char_limit_uses_measured_token_ratio(monkeypatch):
+    # Sin tiktoken se usa la heurística de caracteres por token
+    monkeypatch.setattr(export_module, "_get_encoding", lambda name: None)
+    assert LLMExporter._chunk_char_limit("x" * 100, 0, 10) == 10 * export_module.CHARS_PER_TOKEN
+    assert LLMExporter._chunk_char_limit("x" * 100, 500, 10) == 500
+    assert LLMExporter._chunk_char_limit("x" * 100, 500, 0) == 500
+
+    class TwoCharTokens:
+        def encode_ordinary(self, text):
+            return list(range((len(text) + 1) // 2))
+
+    monkeypatch.setattr(export_module, "_get_encoding", lambda name: TwoCharTokens())
+    assert LLMExporter._chunk_char_limit("x" * 100, 0, 10) == 20
@@ -0,0 +1,178 @@
+"""
+Pruebas de la integración con Git.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from memoria_cursor.core import git_integration
+from memoria_cursor.core.git_integration import GitIntegration
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git no disponible")
+
+
+@pytest.fixture(params=["pygit2", "subprocess"], autouse=True)
+def backend(request, monkeypatch):
+    """Ejecutar cada prueba con pygit2 (si está instalado) y con el binario git."""
+    if request.param == "pygit2":
+        if git_integration.pygit2 is None:
+            pytest.skip("pygit2 no instalado")
+    else:
+        monkeypatch.setattr(git_integration, "pygit2", None)
+    return request.param
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _init_repo(repo: Path) -> None:
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test")
+    (repo / "README.md").write_text("hola\n", encoding="utf-8")
+    _git(repo, "add", "README.md")
+    _git(repo, "commit", "-q", "-m", "Commit inicial")
+
+
+def test_get_git_info_outside_repository(tmp_path: Path):
+    git = GitIntegration(str(tmp_path))
+    assert git.is_git_repository() is False
+    assert git.get_git_info() is None
+
+
+def test_get_git_info_fields(tmp_path: Path):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+
+    info = git.get_git_info()
+    assert info is not None
+    assert len(info["current_commit"]) == 7
+    assert info["branch"] == "main"
+    assert info["commit_message"] == "Commit inicial"
+    assert info["is_clean"] is True
+    assert "remote_url" not in info
+
+
+def test_get_git_info_dirty_and_unborn(tmp_path: Path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    (tmp_path / "nuevo.txt").write_text("x\n", encoding="utf-8")
+    git = GitIntegration(str(tmp_path))
+
+    info = git.get_git_info()
+    assert info is not None
+    assert info["branch"] == "main"
+    assert info["is_clean"] is False
+    assert "current_commit" not in info
+
+
+def test_is_repository_clean_ignores_untracked(tmp_path: Path):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+
+    (tmp_path / "build.log").write_text("x\n", encoding="utf-8")
+    assert git.is_repository_clean() is True
+
+    (tmp_path / "README.md").write_text("cambio\n", encoding="utf-8")
+    assert git.is_repository_clean() is False
+
+
+def test_untracked_files_only_affect_git_info_is_clean(tmp_path: Path):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+
+    # Un archivo sin seguimiento ensucia el árbol de trabajo, pero no los
+    # archivos versionados
+    (tmp_path / "build.log").write_text("x\n", encoding="utf-8")
+    assert git.get_git_info()["is_clean"] is False
+    assert git.is_repository_clean() is True
+
+
+def test_remote_url_is_read_on_demand(tmp_path: Path, monkeypatch):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+    calls = []
+    original = GitIntegration._run_git
+
+    def recording(self, args, timeout=5):
+        calls.append(args[0])
+        return original(self, args, timeout)
+
+    monkeypatch.setattr(GitIntegration, "_run_git", recording)
+    assert "remote_url" not in git.get_git_info()
+    assert "remote" not in calls
+    assert git.get_remote_url() is None
+
+    _git(tmp_path, "remote", "add", "origin", "https://example.com/repo.git")
+    assert git.get_remote_url() == "https://example.com/repo.git"
+    calls.clear()
+    assert git.get_remote_url() == "https://example.com/repo.git"
+    assert calls == []
+
+
+def test_get_git_info_is_cached_until_head_changes(tmp_path: Path, monkeypatch):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+    first = git.get_git_info()
+
+    # Sin cambios en HEAD/index no se lanzan nuevos procesos
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería invocar git")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+    assert git.get_git_info() == first
+    monkeypatch.undo()
+
+    (tmp_path / "otro.txt").write_text("x\n", encoding="utf-8")
+    _git(tmp_path, "add", "otro.txt")
+    _git(tmp_path, "commit", "-q", "-m", "Segundo commit")
+    second = git.get_git_info()
+    assert second["commit_message"] == "Segundo commit"
+    assert second["current_commit"] != first["current_commit"]
+
+
+def test_is_git_repository_without_marker_skips_git(tmp_path: Path, monkeypatch):
+    git = GitIntegration(str(tmp_path))
+    monkeypatch.setattr(git_integration.GitIntegration, "_find_git_dir", lambda self: None)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería invocar git")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+    assert git.is_git_repository() is False
+
+
+def test_get_git_info_does_not_call_rev_parse(tmp_path: Path, monkeypatch):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+    calls = []
+    original = GitIntegration._run_git
+
+    def recording(self, args, timeout=5):
+        calls.append(args[0])
+        return original(self, args, timeout)
+
+    monkeypatch.setattr(GitIntegration, "_run_git", recording)
+    assert git.get_git_info() is not None
+    assert "rev-parse" not in calls
+    assert git.is_git_repository() is True
+
+
+def test_cached_git_info_expires_and_can_be_invalidated(tmp_path: Path, monkeypatch):
+    _init_repo(tmp_path)
+    git = GitIntegration(str(tmp_path))
+    assert git.get_git_info()["is_clean"] is True
+
+    # Un cambio en el árbol de trabajo no toca HEAD ni el index
+    (tmp_path / "README.md").write_text("cambio\n", encoding="utf-8")
+    assert git.get_git_info()["is_clean"] is True
+
+    git.invalidate_cache()
+    assert git.get_git_info()["is_clean"] is False
+
+    (tmp_path / "README.md").write_text("hola\n", encoding="utf-8")
+    monkeypatch.setattr(GitIntegration, "CACHE_TTL", 0.0)
+    assert git.get_git_info()["is_clean"] is True
@@ -0,0 +1,568 @@
+"""
+Pruebas para MemorySystem.
+"""
+
+import gc
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from memoria_cursor.core import memory_system, search_index, serialization
+from memoria_cursor.core.entry import Entry
+from memoria_cursor.core.memory_system import MemorySystem
+
+
+def _titles(entries):
+    return sorted(entry.title for entry in entries)
+
+
+def test_search_uses_index_and_tracks_mutations(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    first = ms.create_entry("note", "Cache de Git", "Evita subprocesos", tags=["perf"])
+    ms.create_entry("bug", "Error de encoding", "Falla con UTF-8", files_affected=["src/IO.py"])
+
+    assert _titles(ms.list_entries(search="git")) == ["Cache de Git"]
+    assert _titles(ms.list_entries(search="SUBPROC")) == ["Cache de Git"]
+    assert _titles(ms.list_entries(search="src/io")) == ["Error de encoding"]
+    # Términos cortos se resuelven sin índice
+    assert _titles(ms.list_entries(search="8")) == ["Error de encoding"]
+
+    ms.update_entry(first, content="Memoiza resultados")
+    assert ms.list_entries(search="subproc") == []
+    assert _titles(ms.list_entries(search="memoiza")) == ["Cache de Git"]
+
+    ms.delete_entry(first)
+    assert ms.list_entries(search="memoiza") == []
+    assert (tmp_path / "entries" / "index.sqlite").exists()
+
+
+def test_search_index_reuses_one_connection(tmp_path: Path, monkeypatch):
+    connections = []
+    original = sqlite3.connect
+
+    def recording(*args, **kwargs):
+        conn = original(*args, **kwargs)
+        if args and args[0] != ":memory:":
+            connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(search_index.sqlite3, "connect", recording)
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(5):
+        ms.create_entry("note", f"Entrada {i}", "Contenido indexado")
+    assert len(ms.list_entries(search="indexado")) == 5
+
+    assert len(connections) == 1
+    ms.close()
+    assert ms.search_index._conn is None
+    assert len(ms.list_entries(search="indexado")) == 5
+
+
+def test_search_index_rebuilds_after_external_edit(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Primera", "Contenido original")
+    assert ms.list_entries(search="original")
+    ms.compact()
+
+    # Editar entries.json fuera del sistema invalida el índice
+    entries_file = tmp_path / "entries" / "entries.json"
+    data = json.loads(entries_file.read_text(encoding="utf-8"))
+    data["entries"][0]["content"] = "Contenido editado a mano"
+    entries_file.write_text(json.dumps(data), encoding="utf-8")
+
+    assert ms.list_entries(search="original") == []
+    assert _titles(ms.list_entries(search="a mano")) == ["Primera"]
+
+
+def test_load_large_entries_file(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(serialization, "MMAP_THRESHOLD", 16 * 1024)
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(6):
+        ms.create_entry("note", f"Entrada {i}", "ñ" * 5000)
+
+    # El archivo supera el umbral de mmap y se relee desde una nueva instancia
+    assert (tmp_path / "entries" / "entries.json").stat().st_size > serialization.MMAP_THRESHOLD
+    entries = MemorySystem(str(tmp_path), auto_git=False).list_entries()
+    assert len(entries) == 6
+    assert entries[0].content == "ñ" * 5000
+
+
+def test_list_entries_filters_by_type_and_tags(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Nota A", "Contenido", tags=["a"])
+    ms.create_entry("bug", "Bug A", "Contenido", tags=["a", "b"])
+    ms.create_entry("bug", "Bug C", "Contenido", tags=["c"])
+
+    assert _titles(ms.list_entries(entry_type="bug")) == ["Bug A", "Bug C"]
+    assert _titles(ms.list_entries(tags=["a"])) == ["Bug A", "Nota A"]
+    assert _titles(ms.list_entries(entry_type="bug", tags=["b", "c"])) == ["Bug A", "Bug C"]
+    assert _titles(ms.list_entries(entry_type="bug", tags=["a"], limit=1)) == ["Bug A"]
+
+    # Los índices en memoria se invalidan al modificar entries.json
+    ms.create_entry("bug", "Bug D", "Contenido", tags=["b"])
+    assert _titles(ms.list_entries(tags=["b"])) == ["Bug A", "Bug D"]
+
+
+def test_list_entries_date_range_and_search(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Reciente", "Contenido actual")
+
+    # Timestamps con zona horaria (UTC) y sin ella conviven en el archivo
+    entries_file = tmp_path / "entries" / "entries.json"
+    data = json.loads(entries_file.read_text(encoding="utf-8"))
+    data["entries"].append({
+        "id": "550e8400-e29b-41d4-a716-446655440000",
+        "timestamp": "2024-03-10T12:00:00",
+        "type": "note",
+        "title": "Antigua",
+        "content": "Contenido histórico",
+    })
+    entries_file.write_text(json.dumps(data), encoding="utf-8")
+
+    assert _titles(ms.list_entries(date_from="2025-01-01")) == ["Reciente"]
+    assert _titles(ms.list_entries(date_to="2024-12-31")) == ["Antigua"]
+    assert _titles(ms.list_entries(date_from="2024-03-10", date_to="2024-03-10")) == ["Antigua"]
+
+    # Otras zonas horarias se comparan en UTC
+    data["entries"].append({
+        "id": "550e8400-e29b-41d4-a716-446655440001",
+        "timestamp": "2024-03-10T23:30:00-03:00",
+        "type": "note",
+        "title": "Otra zona",
+        "content": "Sin coincidencias",
+    })
+    entries_file.write_text(json.dumps(data), encoding="utf-8")
+    assert _titles(ms.list_entries(date_from="2024-03-10", date_to="2024-03-10")) == ["Antigua"]
+    assert _titles(ms.list_entries(date_from="2024-03-11", date_to="2024-12-31")) == ["Otra zona"]
+    assert _titles(ms.list_entries(search="CONTENIDO", date_from="2024-01-01")) == ["Antigua", "Reciente"]
+    # Fechas inválidas se ignoran
+    assert len(ms.list_entries(date_from="no-es-fecha")) == 3
+
+    # Editar una entrada actualiza su fecha en el índice
+    ms.update_entry("550e8400-e29b-41d4-a716-446655440000", title="Antigua editada")
+    assert _titles(ms.list_entries(date_to="2024-12-31")) == ["Otra zona"]
+    assert len(ms.list_entries(date_from="2025-01-01")) == 2
+
+
+def test_schema_validator_is_cached_until_schema_changes(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Primera", "Contenido")
+
+    loads = []
+    original = MemorySystem._load_schema
+    monkeypatch.setattr(MemorySystem, "_load_schema",
+                        lambda self: loads.append(1) or original(self))
+    ms.create_entry("note", "Segunda", "Contenido")
+    assert loads == []
+
+    # Un schema.json del proyecto invalida el validador compilado
+    schema = json.loads(json.dumps(original(ms)))
+    schema["properties"]["title"]["maxLength"] = 5
+    ms.schema_file.write_text(json.dumps(schema), encoding="utf-8")
+    with pytest.raises(ValueError, match="schema.json"):
+        ms.create_entry("note", "Título demasiado largo", "Contenido")
+    assert loads == [1]
+
+
+def test_validation_is_the_same_with_and_without_fastjsonschema(tmp_path: Path, monkeypatch):
+    entry = Entry("note", "Título demasiado largo", "Contenido").to_dict()
+    entry["timestamp"] = "ayer por la tarde"
+    results = []
+    for backend in (memory_system.fastjsonschema, None):
+        monkeypatch.setattr(memory_system, "fastjsonschema", backend)
+        ms = MemorySystem(str(tmp_path / str(len(results))), auto_git=False)
+        # `format` no se comprueba con ninguno de los dos validadores
+        ms._validate_entry_dict(entry)
+
+        schema = json.loads(json.dumps(ms._load_schema()))
+        schema["properties"]["title"]["maxLength"] = 5
+        ms.schema_file.write_text(json.dumps(schema), encoding="utf-8")
+        with pytest.raises(ValueError) as excinfo:
+            ms._validate_entry_dict(entry)
+        results.append(str(excinfo.value))
+
+    assert results[0] == results[1]
+
+
+def test_buffered_writes_flush_on_exit(tmp_path: Path):
+    with MemorySystem(str(tmp_path), auto_git=False, flush_every=10) as ms:
+        entry_id = ms.create_entry("note", "Pendiente", "Sin escribir todavía")
+        ms.update_entry(entry_id, title="Pendiente editada")
+
+        # Las lecturas ven los cambios en memoria antes de escribirse
+        assert _titles(ms.list_entries(search="escribir")) == ["Pendiente editada"]
+        assert MemorySystem(str(tmp_path), auto_git=False).list_entries() == []
+
+    reloaded = MemorySystem(str(tmp_path), auto_git=False)
+    assert _titles(reloaded.list_entries(search="escribir")) == ["Pendiente editada"]
+
+
+def test_buffered_writes_flush_when_object_is_dropped(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False, flush_every=10)
+    for i in range(3):
+        ms.create_entry("note", f"Entrada {i}", "Sin close()")
+    del ms
+    gc.collect()
+
+    reloaded = MemorySystem(str(tmp_path), auto_git=False)
+    assert len(reloaded.list_entries()) == 3
+
+
+def test_load_entries_with_null_lists(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    entry_id = ms.create_entry("note", "Nula", "Contenido", tags=["x"])
+    ms.compact()
+    data = json.loads(ms.entries_file.read_text(encoding="utf-8"))
+    for key in ("tags", "files_affected", "related_entries"):
+        data["entries"][0][key] = None
+    ms.entries_file.write_text(json.dumps(data), encoding="utf-8")
+
+    reloaded = MemorySystem(str(tmp_path), auto_git=False)
+    assert reloaded.get_entry(entry_id).tags == []
+    assert reloaded.list_entries(tags=["x"]) == []
+    assert _titles(reloaded.list_entries(search="nula")) == ["Nula"]
+    assert reloaded.get_statistics()["total_tags"] == []
+
+
+def test_entries_are_not_shared_with_cache(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    tags = ["a"]
+    entry_id = ms.create_entry("note", "Nota", "Contenido", tags=tags)
+    tags.append("b")
+    ms.get_entry(entry_id).add_tag("c")
+
+    assert ms.get_entry(entry_id).tags == ["a"]
+
+
+def test_indexes_follow_mutations(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    first = ms.create_entry("note", "Primera", "Contenido", tags=["a"])
+    second = ms.create_entry("bug", "Segunda", "Contenido", tags=["a"])
+    assert ms.get_entry(second).title == "Segunda"
+
+    # Altas y ediciones actualizan los índices sin reconstruirlos
+    third = ms.create_entry("bug", "Tercera", "Contenido", tags=["b"])
+    ms.update_entry(second, tags=["b"])
+    assert ms._index_key == ms._generation
+    assert _titles(ms.list_entries(tags=["a"])) == ["Primera"]
+    assert _titles(ms.list_entries(entry_type="bug", tags=["b"])) == ["Segunda", "Tercera"]
+
+    assert ms.delete_entry(first) is True
+    assert ms.get_entry(first) is None
+    assert ms.get_entry(third).title == "Tercera"
+    assert ms.list_entries(tags=["a"]) == []
+    assert ms.update_entry(first, title="No existe") is False
+
+
+def test_changes_are_appended_to_log_and_compacted(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(3):
+        ms.create_entry("note", f"Entrada {i}", "Contenido " * 50)
+    ms.compact()
+    assert not ms.entries_log.exists()
+
+    # La instantánea se escribe compacta, sin sangría
+    snapshot = ms.entries_file.read_bytes()
+    assert b"\n" not in snapshot
+    first = ms.list_entries()[0].entry_id
+    ms.update_entry(first, title="Editada")
+    ms.delete_entry(ms.list_entries()[1].entry_id)
+
+    # La instantánea no se reescribe; los cambios quedan en el registro
+    assert ms.entries_file.read_bytes() == snapshot
+    assert len(ms.entries_log.read_text(encoding="utf-8").splitlines()) == 2
+
+    reloaded = MemorySystem(str(tmp_path), auto_git=False)
+    assert _titles(reloaded.list_entries()) == ["Editada", "Entrada 2"]
+    assert reloaded.get_statistics()["total_entries"] == 2
+    assert _titles(reloaded.list_entries(search="editada")) == ["Editada"]
+
+    # Al superar el umbral, el registro se compacta en entries.json
+    for i in range(10):
+        reloaded.update_entry(first, content="Cambio " * 50 + str(i))
+    assert not reloaded.entries_log.exists() or (
+        reloaded.entries_log.stat().st_size
+        <= reloaded.entries_file.stat().st_size * MemorySystem.LOG_COMPACTION_RATIO
+    )
+    data = json.loads(reloaded.entries_file.read_text(encoding="utf-8"))
+    assert len(data["entries"]) == 2
+
+
+def test_update_entry_reads_entries_once(tmp_path: Path, monkeypatch):
+    entry_id = MemorySystem(str(tmp_path), auto_git=False).create_entry("note", "Nota", "Contenido")
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+
+    reads = []
+    original = memory_system.load_path
+    monkeypatch.setattr(memory_system, "load_path", lambda path: reads.append(path) or original(path))
+    assert ms.update_entry(entry_id, title="Editada") is True
+    assert ms.get_entry(entry_id).title == "Editada"
+    assert len(reads) == 1
+
+
+def test_config_is_cached_until_file_changes(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    assert ms._get_config_value("system.max_content_length") == 10000
+
+    opened = []
+    original_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: opened.append(a[0]) or original_open(*a, **k))
+    assert ms._get_config_value("system.max_content_length") == 10000
+    assert ms.config_file not in opened
+    monkeypatch.undo()
+
+    config = json.loads(ms.config_file.read_text(encoding="utf-8"))
+    config["system"]["max_content_length"] = 5
+    ms.config_file.write_text(json.dumps(config), encoding="utf-8")
+    with pytest.raises(ValueError, match="máximo"):
+        ms.create_entry("note", "Nota", "Demasiado largo")
+
+
+def test_backups_are_hardlinks_and_rotated(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    config = json.loads(ms.config_file.read_text(encoding="utf-8"))
+    config["system"]["backup_keep"] = 2
+    ms.config_file.write_text(json.dumps(config), encoding="utf-8")
+    for old in ("entries_backup_20000101_000000.json", "entries_backup_20000102_000000.json"):
+        (ms.entries_dir / old).write_text("{}", encoding="utf-8")
+
+    ms.create_entry("note", "Primera", "Contenido")
+    ms.compact()
+    before = ms.entries_file.read_bytes()
+    ms.create_entry("note", "Segunda", "Contenido")
+    ms.compact()
+
+    backups = sorted(ms.entries_dir.glob("entries_backup_*.json"))
+    assert len(backups) == 2
+    assert not (ms.entries_dir / "entries_backup_20000101_000000.json").exists()
+    # El backup conserva el contenido previo aunque entries.json se reescriba
+    assert backups[-1].read_bytes() == before
+    assert ms.entries_file.read_bytes() != before
+
+
+def test_backups_follow_backup_every_n_writes(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Inicial", "Contenido")
+    ms.compact()
+    for old in ms.entries_dir.glob("entries_backup_*"):
+        old.unlink()
+    ms._writes = 0
+
+    for i in range(5):
+        ms.create_entry("note", f"Entrada {i}", "Contenido")
+    backups = sorted(ms.entries_dir.glob("entries_backup_*.json"))
+    assert len(backups) == 5
+    # El último backup (instantánea más registro sin compactar) refleja el
+    # estado previo a la última escritura
+    log_backup = backups[-1].with_suffix(".jsonl")
+    saved = backups[-1].read_text(encoding="utf-8")
+    if log_backup.exists():
+        saved += log_backup.read_text(encoding="utf-8")
+    assert "Entrada 3" in saved
+    assert "Entrada 4" not in saved
+
+    config = json.loads(ms.config_file.read_text(encoding="utf-8"))
+    config["system"]["backup_every_n_writes"] = 2
+    ms.config_file.write_text(json.dumps(config), encoding="utf-8")
+    for i in range(4):
+        ms.create_entry("note", f"Otra {i}", "Contenido")
+    assert len(list(ms.entries_dir.glob("entries_backup_*.json"))) == 7
+
+
+def test_get_statistics(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    ms.create_entry("note", "Nota", "Contenido", tags=["a", "b"])
+    ms.create_entry("bug", "Bug", "Contenido", tags=["b"])
+    ms.create_entry("bug", "Otro bug", "Contenido")
+
+    stats = ms.get_statistics()
+    assert stats["total_entries"] == 3
+    assert stats["by_type"] == {"note": 1, "bug": 2}
+    assert sum(stats["by_date"].values()) == 3
+    assert sorted(stats["total_tags"]) == ["a", "b"]
+    json.dumps(stats)
+
+
+def test_create_entries_writes_once(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    writes = []
+    original = MemorySystem._append_log
+
+    def recording(self, changes):
+        writes.append(len(changes))
+        return original(self, changes)
+
+    monkeypatch.setattr(MemorySystem, "_append_log", recording)
+    ids = ms.create_entries([
+        {"entry_type": "note", "title": f"Entrada {i}", "content": "Contenido", "tags": ["lote"]}
+        for i in range(5)
+    ])
+
+    assert writes == [5]
+    assert [e.entry_id for e in MemorySystem(str(tmp_path), auto_git=False).list_entries()] == ids
+
+    with pytest.raises(ValueError):
+        ms.create_entries([
+            {"entry_type": "note", "title": "Válida", "content": "x"},
+            {"entry_type": "otro", "title": "Inválida", "content": "x"},
+        ])
+    assert writes == [5, 1]
+    assert len(ms.list_entries()) == 6
+
+
+def test_get_statistics_is_cached_until_entries_change(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    entry_id = ms.create_entry("note", "Nota", "Contenido", tags=["a"])
+    first = ms.get_statistics()
+    first["by_type"]["note"] = 99
+
+    # Sin cambios se reutiliza el resultado (y no se expone el interno)
+    def fail(*args, **kwargs):
+        raise AssertionError("no debería recalcular")
+
+    monkeypatch.setattr(ms, "_compute_statistics", fail)
+    assert ms.get_statistics()["by_type"] == {"note": 1}
+    monkeypatch.undo()
+
+    ms.create_entry("bug", "Bug", "Contenido")
+    assert ms.get_statistics()["by_type"] == {"note": 1, "bug": 1}
+    ms.update_entry(entry_id, tags=["b"])
+    assert ms.get_statistics()["total_tags"] == ["b"]
+    ms.delete_entry(entry_id)
+    assert ms.get_statistics()["total_entries"] == 1
+
+
+def test_log_descriptor_is_reused_and_reopened(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(3):
+        ms.create_entry("note", f"Entrada {i}", "Contenido " * 50)
+    ms.compact()
+
+    first = ms.list_entries()[0].entry_id
+    ms.update_entry(first, title="Uno")
+    fd = ms._log_fd
+    ms.update_entry(first, title="Dos")
+    assert ms._log_fd == fd
+
+    # Otra instancia compacta y elimina el registro: se abre uno nuevo
+    MemorySystem(str(tmp_path), auto_git=False).compact()
+    ms.update_entry(first, title="Tres")
+    ms.close()
+    assert ms._log_fd is None
+    assert MemorySystem(str(tmp_path), auto_git=False).get_entry(first).title == "Tres"
+
+
+@pytest.mark.parametrize("durability, expected", [("none", 0), ("batch", 1), ("strict", 3)])
+def test_durability_modes_group_fsync(tmp_path: Path, monkeypatch, durability, expected):
+    ms = MemorySystem(str(tmp_path), auto_git=False, durability=durability)
+    for i in range(3):
+        ms.create_entry("note", f"Entrada {i}", "Contenido " * 50)
+    ms.compact()
+    entry_id = ms.list_entries()[0].entry_id
+
+    synced = []
+    monkeypatch.setattr(memory_system.os, "fsync", lambda fd: synced.append(fd))
+    for title in ("Uno", "Dos", "Tres"):
+        ms.update_entry(entry_id, title=title)
+    ms.close()
+    assert len(synced) == expected
+
+
+def test_invalid_durability_mode(tmp_path: Path):
+    with pytest.raises(ValueError, match="durabilidad"):
+        MemorySystem(str(tmp_path), auto_git=False, durability="siempre")
+    # Se valida antes de crear archivos
+    assert not (tmp_path / "entries").exists()
+
+
+def test_initial_snapshot_is_synced(tmp_path: Path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(memory_system.os, "fsync", lambda fd: synced.append(fd))
+    MemorySystem(str(tmp_path), auto_git=False, durability="strict")
+    assert len(synced) == 1
+
+
+def test_list_entries_builds_only_returned_entries(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(20):
+        ms.create_entry("bug" if i % 2 else "note", f"Entrada {i:02d}", "Contenido")
+
+    built = []
+    original = memory_system.Entry.from_dict
+    monkeypatch.setattr(memory_system.Entry, "from_dict",
+                        classmethod(lambda cls, data: built.append(data) or original(data)))
+    entries = ms.list_entries(entry_type="bug", search="entrada", offset=2, limit=3)
+
+    assert [entry.title for entry in entries] == ["Entrada 05", "Entrada 07", "Entrada 09"]
+    assert len(built) == 3
+
+
+def test_iter_entries_builds_entries_on_demand(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(5):
+        ms.create_entry("note", f"Entrada {i}", "Contenido")
+
+    built = []
+    original = memory_system.Entry.from_dict
+    monkeypatch.setattr(memory_system.Entry, "from_dict",
+                        classmethod(lambda cls, data: built.append(data) or original(data)))
+    entries = ms.iter_entries(entry_type="note")
+
+    assert next(entries).title == "Entrada 0"
+    assert len(built) == 1
+    assert [entry.title for entry in entries] == [f"Entrada {i}" for i in range(1, 5)]
+    assert len(built) == 5
+
+
+def test_list_entries_after_cursor(tmp_path: Path):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(6):
+        ms.create_entry("bug" if i % 2 else "note", f"Entrada {i}", "Contenido")
+
+    first = ms.list_entries(limit=2)
+    second = ms.list_entries(limit=2, after=first[-1].entry_id)
+    assert _titles(second) == ["Entrada 2", "Entrada 3"]
+
+    # El cursor se combina con los filtros
+    bugs = ms.list_entries(entry_type="bug", after=second[0].entry_id)
+    assert _titles(bugs) == ["Entrada 3", "Entrada 5"]
+
+    with pytest.raises(ValueError):
+        ms.list_entries(after="no-existe")
+
+
+def test_list_entries_limit_stops_scanning(tmp_path: Path, monkeypatch):
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+    for i in range(20):
+        ms.create_entry("note", f"Entrada {i:02d}", "Contenido")
+    ms.list_entries(search="entrada")
+
+    # Con límite, la búsqueda no recorre las entradas posteriores
+    checked = []
+
+    class Texts(list):
+        def __getitem__(self, position):
+            checked.append(position)
+            return list.__getitem__(self, position)
+
+    ms._search_texts = Texts(ms._search_texts)
+    monkeypatch.setattr(ms.search_index, "search_ids", lambda *args: None)
+    entries = ms.list_entries(search="entrada", offset=1, limit=2)
+    assert [entry.title for entry in entries] == ["Entrada 01", "Entrada 02"]
+    assert checked == [0, 1, 2]
+
+
+@pytest.mark.parametrize("backend", ["fastjsonschema", "jsonschema"])
+def test_schema_validation_backends(tmp_path: Path, monkeypatch, backend):
+    if backend == "fastjsonschema":
+        if memory_system.fastjsonschema is None:
+            pytest.skip("fastjsonschema no instalado")
+    else:
+        monkeypatch.setattr(memory_system, "fastjsonschema", None)
+    ms = MemorySystem(str(tmp_path), auto_git=False)
+
+    assert ms.create_entry("note", "Válida", "Contenido")
+    with pytest.raises(ValueError, match="Entrada inválida según schema.json"):
+        ms.create_entry("note", "", "Título vacío")